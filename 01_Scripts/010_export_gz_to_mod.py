@@ -39,9 +39,11 @@ def get_all_static_meshes_in_level():
         if isinstance(actor, unreal.StaticMeshActor):
             total_static_mesh_actors += 1
             actor_name = actor.get_actor_label()
+            # Lowercase the label once and reuse the result for both checks below
+            actor_is_genzone = 'genzone' in actor_name.lower()
             
             # First check: Is 'genzone' in the actor's name?
-            if 'genzone' in actor_name.lower():
+            if actor_is_genzone:
                 genzone_actors += 1
                 unreal.log(f"Found GenZone actor: {actor_name}")
                 
@@ -54,7 +56,7 @@ def get_all_static_meshes_in_level():
                     
                     # Second check: Is 'genzone' in either the actor name OR the mesh name?
                     # This catches cases where the mesh name contains 'genzone' but the actor doesn't
-                    if ('genzone' in mesh_name.lower()) or ('genzone' in actor_name.lower()):
+                    if actor_is_genzone or ('genzone' in mesh_name.lower()):
                         # Add this mesh to our export list (the set automatically prevents duplicates)
                         static_meshes.add(mesh)
                         unreal.log(f"✅ Added to export list: {mesh_name} (from actor {actor_name})")
@@ -135,14 +137,14 @@ def export_static_mesh_to_fbx(static_mesh, export_dir, iteration_number):
             # Success! Let the user know
             unreal.log(f"🎉 Successfully exported {mesh_name} to {export_path}!")
             
-            # Verify the file was actually created
-            if os.path.exists(export_path):
-                file_size = os.path.getsize(export_path)
-                unreal.log(f"   File size: {file_size / 1024:.1f} KB")
-            else:
+            # Verify the file was actually created (a single stat gives us both existence and size)
+            try:
+                file_size = os.stat(export_path).st_size
+            except OSError:
                 # This should never happen if result is True, but just in case
                 unreal.log_warning(f"⚠️ Export reported success but file not found at {export_path}")
                 return False
+            unreal.log(f"   File size: {file_size / 1024:.1f} KB")
         else:
             # Something went wrong with the export
             unreal.log_error(f"⚠️ Failed to export {mesh_name}. Please check the export settings and try again.")
@@ -29,323 +29,410 @@ Parameters:
 --rop_pcg_export1_mat_path: Output path for the material CSV file
 --iteration_number: Iteration number to use for file naming
 --switch_bool: Controls whether to use splines (0) or GenZone meshes (1)
+--max_wait_time: Give up on a cook after this many seconds (default: wait until it finishes)
+--max_inflight: Maximum number of work items the local scheduler cooks at the same time
+--wait_mode: How to wait for the cook - "event" (default), "blocking" or "poll"
+--debug: List the nodes in /obj and the possible TOPnets when the TOPnet can't be found
 """
 
-import hou
 import os
 import time
 import argparse
+import re
+import logging
+import sys
+
+from houdini_headless_utils import (
+    configure_logging, cook_topnet, deferred_updates, ensure_output_directories, limit_scheduler_slots,
+    normalize_path, set_python_code
+)
+
+# All output goes through this logger; the handler is set up when the script is run directly
+log = logging.getLogger('pcghd')
+
+# How many nodes the TOPnet-not-found diagnostic lists before truncating
+MAX_LISTED_NODES = 20
+
+# Patterns used to rewrite the node Python code when a value isn't exposed as a parameter
+# Compiled once here instead of on every substitution
+ITERATION_NUMBER_RE = re.compile(r'iteration_number\s*=\s*\d+')
+BASE_PATH_RE = re.compile(r'base_path\s*=\s*[\'\"].*[\'\"]')
+SPLINES_PATH_RE = re.compile(r'splines_path\s*=\s*[\'\"].*[\'\"]')
+INPUT_RE = re.compile(r'input\s*=\s*\d+')
 
 # Set up our command-line argument parser
 # This allows us to control the script's behavior from the command line
-print("Setting up command-line arguments...")
-parser = argparse.ArgumentParser(description='Generate procedural data using Houdini TOPnet')
+def parse_args(argv=None):
+    """Parse the command-line arguments for the PCG building generation"""
+    log.info("Setting up command-line arguments...")
+    parser = argparse.ArgumentParser(description='Generate procedural data using Houdini TOPnet')
 
-# Required arguments
-parser.add_argument('--hip', required=True, 
-                   help='Path to the Houdini .hip file containing the procedural setup')
+    # Required arguments
+    parser.add_argument('--hip', required=True, 
+                       help='Path to the Houdini .hip file containing the procedural setup')
 
-# Optional arguments with sensible defaults
-parser.add_argument('--topnet', default="/obj/geo1/topnet", 
-                   help='Path to the TOPnet node that will be cooked (default: /obj/geo1/topnet)')
+    # Optional arguments with sensible defaults
+    parser.add_argument('--topnet', default="/obj/geo1/topnet", 
+                       help='Path to the TOPnet node that will be cooked (default: /obj/geo1/topnet)')
                    
-# Input paths - these will be provided by the manager script
-parser.add_argument('--file1_path', default=None, 
-                   help="Path to the input FBX file containing GenZone meshes")
-parser.add_argument('--base_path', default=None,
-                   help="Base path for the splines JSON files (without iteration number and extension)")
+    # Input paths - these will be provided by the manager script
+    parser.add_argument('--file1_path', default=None, 
+                       help="Path to the input FBX file containing GenZone meshes")
+    parser.add_argument('--base_path', default=None,
+                       help="Base path for the splines JSON files (without iteration number and extension)")
                    
-# Output paths - these should be provided by the manager script rather than hardcoded
-parser.add_argument('--rop_pcg_export1_mesh_path', default=None, 
-                   help="Output path for the mesh CSV file")
-parser.add_argument('--rop_pcg_export1_mat_path', default=None, 
-                   help="Output path for the material CSV file")
+    # Output paths - these should be provided by the manager script rather than hardcoded
+    parser.add_argument('--rop_pcg_export1_mesh_path', default=None, 
+                       help="Output path for the mesh CSV file")
+    parser.add_argument('--rop_pcg_export1_mat_path', default=None, 
+                       help="Output path for the material CSV file")
                    
-# Pipeline control parameters
-parser.add_argument('--iteration_number', type=int, default=None, 
-                   help="Iteration number used to find the correct spline JSON file")
-parser.add_argument('--switch_bool', type=int, default=0, 
-                   help="Controls whether to use splines (0) or GenZone meshes (1)")
+    # Pipeline control parameters
+    parser.add_argument('--iteration_number', type=int, default=None, 
+                       help="Iteration number used to find the correct spline JSON file")
+    parser.add_argument('--switch_bool', type=int, default=0, 
+                       help="Controls whether to use splines (0) or GenZone meshes (1)")
+    parser.add_argument('--max_inflight', type=int, default=None,
+                       help="Maximum number of work items the local scheduler cooks at the same time "
+                            "(default: keep the setting saved in the .hip file)")
+    parser.add_argument('--wait_mode', choices=['event', 'poll', 'blocking'], default='event',
+                       help="How to wait for the TOP cook: PDG cook events (default), a blocking cook, or polling")
+    parser.add_argument('--max_wait_time', type=float, default=None,
+                       help="Give up on a cook after this many seconds (default: wait until it finishes)")
+    parser.add_argument('--debug', action='store_true',
+                       help="Print extra diagnostics (e.g. every node in /obj) when something can't be found")
                    
-# Parse the arguments
-args = parser.parse_args()
-
-# Validate required arguments that don't have defaults
-if args.rop_pcg_export1_mesh_path is None:
-    print("WARNING: No mesh CSV output path specified. Output may not be saved correctly.")
-if args.rop_pcg_export1_mat_path is None:
-    print("WARNING: No material CSV output path specified. Output may not be saved correctly.")
+    # Parse the arguments
+    args = parser.parse_args(argv)
+
+    # Normalize all path arguments once, so Houdini gets the same canonical form on every set
+    for path_argument in ('hip', 'file1_path', 'base_path', 'rop_pcg_export1_mesh_path', 'rop_pcg_export1_mat_path'):
+        setattr(args, path_argument, normalize_path(getattr(args, path_argument)))
+    return args
+
+# Node cache - each node path is resolved at most once after the .hip file is loaded
+node_cache = {}
+
+def get_node(node_path):
+    """Return the Houdini node at node_path (or None), resolving it only once"""
+    if node_path not in node_cache:
+        node_cache[node_path] = hou.node(node_path)
+    return node_cache[node_path]
+
+# Helper function to set several parameters on a node with better error handling
+def set_node_parameters(node_path, parameters):
+    """
+    Set several parameters on a Houdini node with a single setParms() call.
+    
+    parameters is a list of (parameter name, value, description) tuples.
+    Returns a dict mapping each parameter name to True if it was set.
+    """
+    results = {parameter_name: False for parameter_name, _, _ in parameters}
     
-# Print a summary of the arguments
-print("\nRunning with the following settings:")
-print(f"  • Houdini File: {args.hip}")
-print(f"  • TOPnet Path: {args.topnet}")
-print(f"  • Input FBX: {args.file1_path if args.file1_path else 'Not specified'}")
-print(f"  • Splines Base Path: {args.base_path if args.base_path else 'Not specified'}")
-print(f"  • Output Mesh CSV: {args.rop_pcg_export1_mesh_path if args.rop_pcg_export1_mesh_path else 'Not specified'}")
-print(f"  • Output Material CSV: {args.rop_pcg_export1_mat_path if args.rop_pcg_export1_mat_path else 'Not specified'}")
-print(f"  • Iteration Number: {args.iteration_number if args.iteration_number is not None else 'Not specified'}")
-print(f"  • Switch Bool: {args.switch_bool} ({'Use GenZone meshes' if args.switch_bool == 1 else 'Use splines'})")
-print()
-
-# Helper function to set a parameter on a node with better error handling
-def set_node_parameter(node_path, parameter_name, value, description=None):
-    """Set a parameter on a Houdini node with better error handling and logging"""
-    if value is None:
-        print(f"Skipping {node_path}.{parameter_name} (no value provided)")
-        return False
-        
     # Get the node
-    node = hou.node(node_path)
+    node = get_node(node_path)
     if node is None:
-        print(f"⚠️ WARNING: Could not find node {node_path}")
-        return False
+        log.warning(f"⚠️ WARNING: Could not find node {node_path}")
+        return results
         
-    # Get the parameter
-    parm = node.parm(parameter_name)
-    if parm is None:
-        print(f"⚠️ WARNING: Parameter '{parameter_name}' not found on {node_path}")
-        return False
+    # Collect the parameters that exist on the node and actually need a new value
+    pending = {}
+    for parameter_name, value, description in parameters:
+        if value is None:
+            log.info(f"Skipping {node_path}.{parameter_name} (no value provided)")
+            continue
+        parm = node.parm(parameter_name)
+        if parm is None:
+            log.warning(f"⚠️ WARNING: Parameter '{parameter_name}' not found on {node_path}")
+            continue
+        results[parameter_name] = True
+        # Setting a parm always dirties everything downstream of it, so leave
+        # parameters that already hold this value alone (compared as text, like we set them)
+        if str(parm.eval()) == str(value):
+            log.info(f"✅ {node_path}.{parameter_name} already set to: {value}")
+            continue
+        # Set the parameter value with its native type so int/float parms don't re-parse a string
+        # (string parameters still get the value as text)
+        if parm.parmTemplate().dataType() == hou.parmData.String:
+            pending[parameter_name] = str(value)
+        else:
+            pending[parameter_name] = value
         
-    # Set the parameter value (convert to string to avoid type errors)
-    parm.set(str(value))
+    # Set them all at once, so the node only dirties its dependents once
+    if pending:
+        node.setParms(pending)
     
-    # Log the success
-    desc = description or f"Set {node_path}.{parameter_name}"
-    print(f"✅ {desc}: {value}")
-    return True
-
-# Load the Houdini file
-print("\n🔄 Loading Houdini file...")
-hip_file_path = args.hip
-hou.hipFile.load(hip_file_path)
-print(f"✅ Successfully loaded: {hip_file_path}")
-
-# Now let's configure all the nodes with our parameters
-print("\n🔧 Configuring Houdini nodes...")
-
-# 1. Set the input FBX file path (GenZone meshes)
-set_node_parameter(
-    '/obj/geo1/file1', 'file', args.file1_path,
-    "Set input FBX file for GenZone meshes"
-)
+    # Log the successes
+    for parameter_name, value, description in parameters:
+        if parameter_name in pending:
+            desc = description or f"Set {node_path}.{parameter_name}"
+            log.info(f"✅ {desc}: {value}")
+    return results
 
-# 2. Set the output paths for the CSV files
-# Both parameters are on the same node, so we can check once
-pcg_export_node = hou.node('/obj/geo1/pcg_export1')
-if pcg_export_node is None:
-    print("⚠️ WARNING: Could not find PCG export node (/obj/geo1/pcg_export1)")
-else:
-    # Set mesh CSV output path
-    if args.rop_pcg_export1_mesh_path is not None:
-        mesh_parm = pcg_export_node.parm('file_mesh')
-        if mesh_parm is not None:
-            mesh_parm.set(args.rop_pcg_export1_mesh_path)
-            print(f"✅ Set mesh CSV output path: {args.rop_pcg_export1_mesh_path}")
-        else:
-            print("⚠️ WARNING: 'file_mesh' parameter not found on PCG export node")
-            
-    # Set material CSV output path
-    if args.rop_pcg_export1_mat_path is not None:
-        mat_parm = pcg_export_node.parm('file_mat')
-        if mat_parm is not None:
-            mat_parm.set(args.rop_pcg_export1_mat_path)
-            print(f"✅ Set material CSV output path: {args.rop_pcg_export1_mat_path}")
-        else:
-            print("⚠️ WARNING: 'file_mat' parameter not found on PCG export node")
-
-# 3. Set the iteration number and base_path parameters for the spline import
-# This is a special case because these might be in the Python code rather than parameters
-print("\n📚 Setting parameters for spline import...")
-
-# Get the Python node that imports splines
-python_node = hou.node('/obj/geo1/python_import_splines_from_json')
-if python_node is None:
-    print("⚠️ WARNING: Could not find Python spline import node")
-else:
-    # First handle the iteration_number parameter
-    if args.iteration_number is not None:
-        print("Setting iteration number...")
-        # First try to set the parameter directly if it exists
-        if python_node.parm('iteration_number') is not None:
-            # Use our helper function
-            set_node_parameter(
-                '/obj/geo1/python_import_splines_from_json', 'iteration_number', args.iteration_number,
-                f"Set iteration number for spline import"
-            )
-        else:
-            # If the parameter doesn't exist directly, it might be in the Python node's code
-            print("Parameter 'iteration_number' not found, trying to modify Python code...")
-            python_code_parm = python_node.parm('python')
-            if python_code_parm is not None:
-                current_code = python_code_parm.eval()
-                # Look for a line defining iteration_number
-                if 'iteration_number' in current_code:
-                    # Replace the line with our new value
-                    import re
-                    new_code = re.sub(r'iteration_number\s*=\s*\d+', f'iteration_number = {args.iteration_number}', current_code)
-                    python_code_parm.set(new_code)
-                    print(f"✅ Modified Python code to set iteration_number to: {args.iteration_number}")
-                else:
-                    print("⚠️ WARNING: Could not find 'iteration_number' in the Python code to modify")
-            else:
-                print("⚠️ WARNING: Could not access Python code parameter in the node")
+# Helper function to report on an output file with a single stat call
+def report_output_file(path, label):
+    """Print whether an output file exists, with its size and modification time"""
+    try:
+        file_stat = os.stat(path) if path else None
+    except OSError:
+        file_stat = None
+    if file_stat is None:
+        log.warning(f"⚠️ {label} file not found or not specified")
+        return None
+    modified = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(file_stat.st_mtime))
+    log.info(f"✅ {label} file created: {path} ({file_stat.st_size/1024:.1f} KB, modified {modified})")
+    return file_stat
+
+def main(args):
+    """Load the .hip file, apply the parameters, cook the TOPnet and check the CSV outputs"""
+    # Validate required arguments that don't have defaults
+    if args.rop_pcg_export1_mesh_path is None:
+        log.warning("WARNING: No mesh CSV output path specified. Output may not be saved correctly.")
+    if args.rop_pcg_export1_mat_path is None:
+        log.warning("WARNING: No material CSV output path specified. Output may not be saved correctly.")
+    
+    # Print a summary of the arguments (as a single log record)
+    settings = [
+        f"Houdini File: {args.hip}",
+        f"TOPnet Path: {args.topnet}",
+        f"Input FBX: {args.file1_path if args.file1_path else 'Not specified'}",
+        f"Splines Base Path: {args.base_path if args.base_path else 'Not specified'}",
+        f"Output Mesh CSV: {args.rop_pcg_export1_mesh_path if args.rop_pcg_export1_mesh_path else 'Not specified'}",
+        f"Output Material CSV: {args.rop_pcg_export1_mat_path if args.rop_pcg_export1_mat_path else 'Not specified'}",
+        f"Iteration Number: {args.iteration_number if args.iteration_number is not None else 'Not specified'}"
+    ]
+    if args.max_inflight is not None:
+        settings.append(f"Max In-Flight Work Items: {args.max_inflight}")
+    settings.append(f"Wait Mode: {args.wait_mode}")
+    if args.max_wait_time is not None:
+        settings.append(f"Max Wait Time: {args.max_wait_time}s")
+    settings.append(f"Switch Bool: {args.switch_bool} ({'Use GenZone meshes' if args.switch_bool == 1 else 'Use splines'})")
+    log.info("\nRunning with the following settings:\n" + "\n".join(f"  • {setting}" for setting in settings) + "\n")
+
+    # Load the Houdini file
+    log.info("\n🔄 Loading Houdini file...")
+    hip_file_path = args.hip
+    hou.hipFile.load(hip_file_path, suppress_save_prompt=True, ignore_load_warnings=True)
+    log.info(f"✅ Successfully loaded: {hip_file_path}")
+
+    # Now let's configure all the nodes with our parameters
+    log.info("\n🔧 Configuring Houdini nodes...")
+
+    # All parameter edits are applied in manual update mode so the dependent SOPs
+    # cook once with the final values instead of after every single set
+    with deferred_updates():
+        # Every parameter we set from the command line, applied in a single pass
+        # Each entry is (value, node path, parameter name, description)
+        switch_bool_description = f"Set switch_bool to {args.switch_bool} ({'Use GenZone meshes' if args.switch_bool == 1 else 'Use splines'})"
+        parameter_map = [
+            # 1. The input FBX file path (GenZone meshes)
+            (args.file1_path, '/obj/geo1/file1', 'file', "Set input FBX file for GenZone meshes"),
+            # 2. The output paths for the CSV files (both on the PCG export node)
+            (args.rop_pcg_export1_mesh_path, '/obj/geo1/pcg_export1', 'file_mesh', "Set mesh CSV output path"),
+            (args.rop_pcg_export1_mat_path, '/obj/geo1/pcg_export1', 'file_mat', "Set material CSV output path"),
+            # 3. The iteration number and base_path parameters for the spline import
+            (args.iteration_number, '/obj/geo1/python_import_splines_from_json', 'iteration_number', "Set iteration number for spline import"),
+            (args.base_path, '/obj/geo1/python_import_splines_from_json', 'base_path', "Set base path for spline import"),
+            # 4. The switch_bool parameter to control whether to use splines or GenZone meshes
+            (args.switch_bool, '/obj/geo1/switch_bool', 'input', switch_bool_description),
+        ]
+
+        # Remember which parameters could be set directly, so we know where to fall back to code edits
+        # Parameters on the same node are grouped so each node gets a single setParms() call
+        parameters_by_node = {}
+        for value, node_path, parameter_name, description in parameter_map:
+            if value is None:
+                continue
+            parameters_by_node.setdefault(node_path, []).append((parameter_name, value, description))
     
-    # Now handle the base_path parameter
-    if args.base_path is not None:
-        print("Setting splines base path...")
-        # First try to set the parameter directly if it exists
-        if python_node.parm('base_path') is not None:
-            # Use our helper function
-            set_node_parameter(
-                '/obj/geo1/python_import_splines_from_json', 'base_path', args.base_path,
-                f"Set base path for spline import"
-            )
+        parameters_set = {}
+        for node_path, parameters in parameters_by_node.items():
+            for parameter_name, was_set in set_node_parameters(node_path, parameters).items():
+                parameters_set[(node_path, parameter_name)] = was_set
+
+        # Some of these might be in the Python code rather than parameters,
+        # so for the ones that couldn't be set directly we try to edit the code instead
+        log.info("\n📚 Checking parameters for spline import...")
+
+        # Get the Python node that imports splines
+        python_node = get_node('/obj/geo1/python_import_splines_from_json')
+        if python_node is None:
+            log.warning("⚠️ WARNING: Could not find Python spline import node")
         else:
-            # If the parameter doesn't exist directly, it might be in the Python node's code
-            print("Parameter 'base_path' not found, trying to modify Python code...")
-            python_code_parm = python_node.parm('python')
-            if python_code_parm is not None:
-                current_code = python_code_parm.eval()
-                # Look for a line defining base_path or splines_path
-                if 'base_path' in current_code:
-                    # Replace the line with our new value
-                    import re
-                    new_code = re.sub(r'base_path\s*=\s*[\'\"].*[\'\"]', f'base_path = "{args.base_path}"', current_code)
-                    python_code_parm.set(new_code)
-                    print(f"✅ Modified Python code to set base_path to: {args.base_path}")
-                elif 'splines_path' in current_code:
-                    # It might be called splines_path instead
-                    new_code = re.sub(r'splines_path\s*=\s*[\'\"].*[\'\"]', f'splines_path = "{args.base_path}"', current_code)
-                    python_code_parm.set(new_code)
-                    print(f"✅ Modified Python code to set splines_path to: {args.base_path}")
-                else:
-                    print("⚠️ WARNING: Could not find 'base_path' or 'splines_path' in the Python code to modify")
-                    # As a fallback, we can try to add the base_path to the code
+            # First handle the iteration_number parameter
+            if args.iteration_number is not None and not parameters_set[('/obj/geo1/python_import_splines_from_json', 'iteration_number')]:
+                # If the parameter doesn't exist directly, it might be in the Python node's code
+                log.info("Parameter 'iteration_number' not found, trying to modify Python code...")
+                python_code_parm = python_node.parm('python')
+                if python_code_parm is not None:
+                    current_code = python_code_parm.eval()
+                    # Look for a line defining iteration_number
                     if 'iteration_number' in current_code:
-                        # Add the base_path right after the iteration_number
-                        lines = current_code.split('\n')
-                        for i, line in enumerate(lines):
-                            if 'iteration_number' in line and '=' in line:
-                                lines.insert(i+1, f'base_path = "{args.base_path}"  # Added by headless script')
-                                new_code = '\n'.join(lines)
-                                python_code_parm.set(new_code)
-                                print(f"✅ Added base_path to Python code: {args.base_path}")
-                                break
-            else:
-                print("⚠️ WARNING: Could not access Python code parameter in the node")
-
-# 4. Set the switch_bool parameter to control whether to use splines or GenZone meshes
-print("\n🔍 Setting switch_bool parameter...")
-if set_node_parameter(
-    '/obj/geo1/switch_bool', 'input', args.switch_bool,
-    f"Set switch_bool to {args.switch_bool} ({'Use GenZone meshes' if args.switch_bool == 1 else 'Use splines'})"
-):
-    # Success, parameter was set directly
-    pass
-else:
-    # Try to modify the Python code if the parameter doesn't exist directly
-    switch_bool_node = hou.node('/obj/geo1/switch_bool')
-    if switch_bool_node is not None:
-        python_code_parm = switch_bool_node.parm('python')
-        if python_code_parm is not None:
-            current_code = python_code_parm.eval()
-            # Look for a line defining input
-            if 'input' in current_code:
-                # Replace the line with our new value
-                import re
-                new_code = re.sub(r'input\s*=\s*\d+', f'input = {args.switch_bool}', current_code)
-                python_code_parm.set(new_code)
-                print(f"✅ Modified Python code to set input to: {args.switch_bool}")
-            else:
-                print("⚠️ WARNING: Could not find 'input' in the Python code to modify")
-        else:
-            print("⚠️ WARNING: Could not access Python code parameter in the node")
+                        # Replace the line with our new value
+                        new_code, replaced = ITERATION_NUMBER_RE.subn(f'iteration_number = {args.iteration_number}', current_code)
+                        if replaced:
+                            set_python_code(python_code_parm, current_code, new_code, f"iteration_number to: {args.iteration_number}")
+                        else:
+                            log.warning("⚠️ WARNING: Found 'iteration_number' in the Python code but no assignment to replace")
+                    else:
+                        log.warning("⚠️ WARNING: Could not find 'iteration_number' in the Python code to modify")
+                else:
+                    log.warning("⚠️ WARNING: Could not access Python code parameter in the node")
+
+            # Now handle the base_path parameter
+            if args.base_path is not None and not parameters_set[('/obj/geo1/python_import_splines_from_json', 'base_path')]:
+                # If the parameter doesn't exist directly, it might be in the Python node's code
+                log.info("Parameter 'base_path' not found, trying to modify Python code...")
+                python_code_parm = python_node.parm('python')
+                if python_code_parm is not None:
+                    current_code = python_code_parm.eval()
+                    # Look for a line defining base_path or splines_path
+                    if 'base_path' in current_code:
+                        # Replace the line with our new value
+                        new_code = BASE_PATH_RE.sub(lambda match: f'base_path = "{args.base_path}"', current_code)
+                        set_python_code(python_code_parm, current_code, new_code, f"base_path to: {args.base_path}")
+                    elif 'splines_path' in current_code:
+                        # It might be called splines_path instead
+                        new_code = SPLINES_PATH_RE.sub(lambda match: f'splines_path = "{args.base_path}"', current_code)
+                        set_python_code(python_code_parm, current_code, new_code, f"splines_path to: {args.base_path}")
+                    else:
+                        log.warning("⚠️ WARNING: Could not find 'base_path' or 'splines_path' in the Python code to modify")
+                        # As a fallback, we can try to add the base_path to the code
+                        if 'iteration_number' in current_code:
+                            # Add the base_path right after the iteration_number
+                            lines = current_code.split('\n')
+                            for i, line in enumerate(lines):
+                                if 'iteration_number' in line and '=' in line:
+                                    lines.insert(i+1, f'base_path = "{args.base_path}"  # Added by headless script')
+                                    new_code = '\n'.join(lines)
+                                    python_code_parm.set(new_code)
+                                    log.info(f"✅ Added base_path to Python code: {args.base_path}")
+                                    break
+                else:
+                    log.warning("⚠️ WARNING: Could not access Python code parameter in the node")
+
+        # If the switch_bool parameter doesn't exist directly, try to modify the Python code
+        if not parameters_set[('/obj/geo1/switch_bool', 'input')]:
+            switch_bool_node = get_node('/obj/geo1/switch_bool')
+            if switch_bool_node is not None:
+                python_code_parm = switch_bool_node.parm('python')
+                if python_code_parm is not None:
+                    current_code = python_code_parm.eval()
+                    # Look for a line defining input
+                    if 'input' in current_code:
+                        # Replace the line with our new value
+                        new_code, replaced = INPUT_RE.subn(f'input = {args.switch_bool}', current_code)
+                        if replaced:
+                            set_python_code(python_code_parm, current_code, new_code, f"input to: {args.switch_bool}")
+                        else:
+                            log.warning("⚠️ WARNING: Found 'input' in the Python code but no assignment to replace")
+                    else:
+                        log.warning("⚠️ WARNING: Could not find 'input' in the Python code to modify")
+                else:
+                    log.warning("⚠️ WARNING: Could not access Python code parameter in the node")
 
-# Now let's find and cook the TOPnet
-print("\n🍳 Preparing to cook the TOP network...")
-topnet_path = args.topnet
-print(f"Looking for TOPnet at: {topnet_path}")
+    # Now let's find and cook the TOPnet
+    log.info("\n🍳 Preparing to cook the TOP network...")
+    topnet_path = args.topnet
+    log.info(f"Looking for TOPnet at: {topnet_path}")
 
-# Find the TOPnet node
-topnet_node = hou.node(topnet_path)
-if not topnet_node:
-    print(f"❌ ERROR: TOP network not found at {topnet_path}")
+    # Find the TOPnet node
+    topnet_node = get_node(topnet_path)
+    if not topnet_node:
+        log.error(f"❌ ERROR: TOP network not found at {topnet_path}")
     
-    # List available nodes to help debugging
-    print("\nAvailable nodes in /obj:")
-    for node in hou.node("/obj").children():
-        print(f"  • {node.path()}")
-        
-    # List available networks that might be TOPnets
-    print("\nPossible TOPnets:")
-    for node in hou.nodeType(hou.topNodeType()).instances():
-        print(f"  • {node.path()}")
+        # List the nodes in /obj and the networks that might be TOPnets to help debugging
+        # (only with --debug, since this creates a Python wrapper for every node in /obj
+        # and can mean searching the whole scene)
+        if args.debug:
+            obj_paths = [node.path() for node in hou.node("/obj").children()]
+            log.error("Available nodes in /obj (%d): %s", len(obj_paths), ", ".join(obj_paths[:MAX_LISTED_NODES]))
+            topnet_paths = [node.path() for node in hou.objNodeTypeCategory().nodeType("topnet").instances()]
+            log.info("\nPossible TOPnets:\n" + "\n".join(f"  • {path}" for path in topnet_paths))
+        else:
+            log.info("Run with --debug to list the nodes in /obj and the possible TOPnets")
         
-    print("\nPlease check the --topnet argument and make sure it points to a valid TOP network.")
-    exit(1)
+        log.info("\nPlease check the --topnet argument and make sure it points to a valid TOP network.")
+        sys.exit(1)
 
-print(f"✅ Found TOPnet: {topnet_node.path()}")
+    log.info(f"✅ Found TOPnet: {topnet_node.path()}")
 
-# Check if the cookbutton parameter exists
-print("Looking for the 'cookbutton' parameter...")
-cookbutton = topnet_node.parm("cookbutton")
-if not cookbutton:
-    print("❌ ERROR: 'cookbutton' parameter not found on the TOPnet node")
+    # Find the node the TOP network cooks (the one with the display flag)
+    log.info("Looking for the TOPnet output (display) node...")
+    output_node = topnet_node.displayNode()
+    if not output_node:
+        log.error("❌ ERROR: No display node found inside the TOPnet")
     
-    # List available parameters to help debugging
-    print("\nAvailable parameters on the TOPnet node:")
-    for parm in topnet_node.parms():
-        print(f"  • {parm.name()}: {parm.description()}")
+        # List available TOP nodes to help debugging
+        log.info("\nAvailable nodes in the TOPnet:\n" + "\n".join(f"  • {node.path()}" for node in topnet_node.children()))
         
-    print("\nThe TOPnet might not be properly configured for cooking.")
-    exit(1)
+        log.info("\nThe TOPnet might not be properly configured for cooking.")
+        sys.exit(1)
 
-print("✅ Found 'cookbutton' parameter")
+    log.info(f"✅ Found output node: {output_node.path()}")
 
-# Cook the TOPnet by pressing the cookbutton
-try:
-    print("\n🔥 Starting the cooking process...")
-    
-    # Press the cookbutton to start cooking
-    cookbutton.pressButton()
-    print("✅ Cook button pressed, TOP network execution started")
-    
-    # Wait for cooking to start
-    print("Waiting for cooking to start (this may take a moment)...")
-    for i in range(5):
-        print(f"  ⏳ {5-i} seconds remaining...")
-        time.sleep(5)
-    
-    # Wait for cooking to complete
-    # Note: We can't easily check if cooking is still in progress in headless mode,
-    # so we just wait a reasonable amount of time
-    print("\nWaiting for cook to complete...")
-    for i in range(2):
-        print(f"  ⏳ {10-i*5} seconds remaining...")
-        time.sleep(5)
+    # Bound the number of work items cooking at the same time (if requested)
+    limit_scheduler_slots(topnet_node, args.max_inflight)
+
+    # Cook the TOPnet's output node directly
+    # This starts the PDG cook without going through the cookbutton parameter, and instead of
+    # sleeping for a fixed amount of time we wait for PDG to report the cook as complete
+    try:
+        log.info("\n🔥 Starting the cooking process...")
+        start_time = time.monotonic()
     
-    print("✅ TOP network cook should be completed")
+        finished, cook_errors = cook_topnet(output_node, args.wait_mode, args.max_wait_time)
+        if not finished:
+            log.error(f"❌ Error cooking TOP network: cook did not finish within {args.max_wait_time}s")
+            sys.exit(1)
+        if cook_errors:
+            log.error(f"❌ Error cooking TOP network: cook reported {len(cook_errors)} error(s)")
+            sys.exit(1)
     
-except Exception as e:
-    print(f"❌ Error cooking TOP network: {str(e)}")
-    exit(1)
-
-# Check for output files
-print("\n💾 Checking for output files...")
-if args.rop_pcg_export1_mesh_path and os.path.exists(args.rop_pcg_export1_mesh_path):
-    file_size = os.path.getsize(args.rop_pcg_export1_mesh_path)
-    print(f"✅ Mesh CSV file created: {args.rop_pcg_export1_mesh_path} ({file_size/1024:.1f} KB)")
-else:
-    print("⚠️ Mesh CSV file not found or not specified")
+        elapsed = time.monotonic() - start_time
+        log.info(f"✅ TOP network cook completed ({elapsed:.1f}s)")
     
-if args.rop_pcg_export1_mat_path and os.path.exists(args.rop_pcg_export1_mat_path):
-    file_size = os.path.getsize(args.rop_pcg_export1_mat_path)
-    print(f"✅ Material CSV file created: {args.rop_pcg_export1_mat_path} ({file_size/1024:.1f} KB)")
-else:
-    print("⚠️ Material CSV file not found or not specified")
-
-print("\n🎉 Script completed successfully")
-print("PCG building data has been generated and exported to CSV files.")
-print("The next step is to create PCG graphs in Unreal Engine using this data.")
-print("" + "-"*80)
\ No newline at end of file
+    except Exception as e:
+        log.error(f"❌ Error cooking TOP network: {str(e)}")
+        sys.exit(1)
+
+    # Check for output files
+    log.info("\n💾 Checking for output files...")
+    report_output_file(args.rop_pcg_export1_mesh_path, "Mesh CSV")
+    report_output_file(args.rop_pcg_export1_mat_path, "Material CSV")
+
+    log.info("\n🎉 Script completed successfully")
+    log.info("PCG building data has been generated and exported to CSV files.")
+    log.info("The next step is to create PCG graphs in Unreal Engine using this data.")
+    log.info("" + "-"*80)
+
+
+# ======================================================================
+# Main Execution
+# ======================================================================
+
+if __name__ == "__main__":
+    # Log through a single batched stdout handler
+    configure_logging()
+
+    args = parse_args()
+
+    # Check if the hip file exists before importing hou
+    # Initializing the Houdini module takes seconds, so a bad path should fail before that
+    if not os.path.isfile(args.hip):
+        log.error(f"❌ ERROR: Houdini file not found at: {args.hip}")
+        log.info("Please check the path and make sure the file exists.")
+        sys.exit(1)
+
+    # Make sure the output folders exist, so a bad path fails now instead of deep inside the cook
+    ensure_output_directories((args.rop_pcg_export1_mesh_path, args.rop_pcg_export1_mat_path))
+
+    import hou
+
+    try:
+        main(args)
+    finally:
+        logging.shutdown()
+
+    # Exit with an explicit success code so callers can rely on it instead of scraping the log
+    sys.exit(0)
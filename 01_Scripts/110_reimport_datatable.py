@@ -98,6 +98,25 @@ def reimport_datatables(iteration_number=None, csv_dir=None):
     editor_lib = unreal.EditorAssetLibrary
     asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
     
+    # Build the CSV factory and its import settings once and share them across all imports.
+    # Only the row struct differs between DataTables, so we just update that per CSV
+    # instead of allocating a new factory and settings object every time.
+    csv_factory = unreal.CSVImportFactory()
+    import_settings = unreal.CSVImportSettings()
+    import_settings.import_type = unreal.CSVImportType.ECSV_DATA_TABLE
+    
+    # Look up everything that already exists in the destination folders with a single
+    # asset registry query, so each DataTable/template check is just a set lookup
+    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    destination_paths = sorted({import_data["destination_path"] for import_data in csv_imports})
+    existing_assets = {
+        str(asset_data.package_name)
+        for asset_data in asset_registry.get_assets(
+            unreal.ARFilter(package_paths=destination_paths, recursive_paths=False)
+        )
+    }
+    print(f"Found {len(existing_assets)} existing assets in {', '.join(destination_paths)}")
+    
     # Keep track of our progress
     success_count = 0
     
@@ -123,7 +142,7 @@ def reimport_datatables(iteration_number=None, csv_dir=None):
                 continue
             
             # Check if we're creating a new asset or updating an existing one
-            asset_exists = editor_lib.does_asset_exist(full_asset_path)
+            asset_exists = full_asset_path in existing_assets
             if asset_exists:
                 print(f"ℹ️ Asset already exists - will perform a reimport")
             else:
@@ -132,7 +151,7 @@ def reimport_datatables(iteration_number=None, csv_dir=None):
             # Get the row structure from the template DataTable
             print(f"Looking for template at: {template_path}")
             row_struct = None
-            if editor_lib.does_asset_exist(template_path):
+            if template_path in existing_assets:
                 template_dt = editor_lib.load_asset(template_path)
                 if template_dt and isinstance(template_dt, unreal.DataTable):
                     row_struct = template_dt.get_editor_property("row_struct")
@@ -155,13 +174,6 @@ def reimport_datatables(iteration_number=None, csv_dir=None):
             task.automated = True  # Don't show any UI
             task.save = True       # Save the asset after import
             
-            # Create and configure a CSV import factory
-            csv_factory = unreal.CSVImportFactory()
-            
-            # Configure the import settings
-            import_settings = unreal.CSVImportSettings()
-            import_settings.import_type = unreal.CSVImportType.ECSV_DATA_TABLE
-            
             # Different versions of UE use different property names for the row struct
             # We'll try all known variations to ensure compatibility
             try:
@@ -181,7 +193,7 @@ def reimport_datatables(iteration_number=None, csv_dir=None):
             # Apply the import settings to the factory
             csv_factory.set_editor_property("automated_import_settings", import_settings)
             
-            # Assign the factory to our task
+            # Assign the shared factory to our task
             task.factory = csv_factory
             
             # Now let's perform the actual import
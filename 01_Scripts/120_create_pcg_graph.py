@@ -18,6 +18,32 @@ import unreal
 # The PCG graph uses the DataTables imported in the previous step to generate
 # procedural buildings in the level based on the splines and GenZone meshes.
 
+class _LogBuffer:
+    """Collects log lines and writes them to the Output Log as one multiline message"""
+    
+    def __init__(self):
+        self.lines = []
+    
+    def info(self, msg):
+        """Queue an info line until the next flush"""
+        self.lines.append(msg)
+    
+    def warning(self, msg):
+        """Flush queued lines, then log a warning right away"""
+        self.flush()
+        unreal.log_warning(msg)
+    
+    def error(self, msg):
+        """Flush queued lines, then log an error right away"""
+        self.flush()
+        unreal.log_error(msg)
+    
+    def flush(self):
+        """Write all queued lines with a single unreal.log call"""
+        if self.lines:
+            unreal.log("\n".join(self.lines))
+            self.lines = []
+
 def create_pcg_graph(iteration_number=None, template_bp_path=None):
     """
     Entry point function called by the manager script
@@ -70,6 +96,10 @@ def duplicate_and_rename_pcg_blueprint(iteration_number=0, template_blueprint_pa
     Returns:
         unreal.Blueprint: The newly created blueprint asset, or None if the operation failed
     """
+    # Status lines are collected and written to the Output Log once per section;
+    # warnings and errors still go out immediately
+    log = _LogBuffer()
+    
     # Define source and destination paths for the blueprint
     if template_blueprint_path is None:
         # Use the default template path if none was provided
@@ -78,129 +108,159 @@ def duplicate_and_rename_pcg_blueprint(iteration_number=0, template_blueprint_pa
     # Define the destination folder and naming convention
     destination_folder_path = "/Game/luk4m4_Undini/BP/BP_PCG_HD_inst"
     new_blueprint_name = f"BPi_PCG_HD_{iteration_number}"
-    full_destination_path = f"{destination_folder_path}/{new_blueprint_name}"
+    full_destination_path = unreal.Paths.combine([destination_folder_path, new_blueprint_name])
     
-    unreal.log(f"\n📚 Blueprint creation details:")
-    unreal.log(f"  • Template: {template_blueprint_path}")
-    unreal.log(f"  • Destination: {destination_folder_path}")
-    unreal.log(f"  • New name: {new_blueprint_name}")
-    unreal.log(f"  • Full path: {full_destination_path}")
+    log.info(f"\n📚 Blueprint creation details:")
+    log.info(f"  • Template: {template_blueprint_path}")
+    log.info(f"  • Destination: {destination_folder_path}")
+    log.info(f"  • New name: {new_blueprint_name}")
+    log.info(f"  • Full path: {full_destination_path}")
+    log.flush()
 
 
     # Get the Unreal Engine asset management utilities we need
-    unreal.log("\n🔍 Getting Unreal Engine asset management utilities...")
-    asset_tools_helper = unreal.AssetToolsHelpers.get_asset_tools()
-    editor_asset_library = unreal.EditorAssetLibrary
+    # (UE5 editor subsystems rather than the deprecated EditorAssetLibrary/EditorLevelLibrary statics)
+    log.info("\n🔍 Getting Unreal Engine asset management utilities...")
+    editor_asset_subsystem = unreal.get_editor_subsystem(unreal.EditorAssetSubsystem)
+    editor_actor_subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
+    unreal_editor_subsystem = unreal.get_editor_subsystem(unreal.UnrealEditorSubsystem)
+    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    
+    # Look up the template and the destination blueprint with one in-memory registry query
+    # instead of probing each path separately (package names drop the ".ObjectName" suffix)
+    template_package_name = template_blueprint_path.split(".")[0]
+    # The registry returns FAssetData entries, so nothing is loaded here
+    existing_packages = {
+        str(asset_data.package_name): asset_data
+        for asset_data in asset_registry.get_assets(
+            unreal.ARFilter(package_names=[template_package_name, full_destination_path])
+        )
+    }
 
     # First, let's make sure the template blueprint exists
-    unreal.log("\n🔍 Checking if template blueprint exists...")
-    if not editor_asset_library.does_asset_exist(template_blueprint_path):
-        unreal.log_error(f"❌ Template blueprint not found: {template_blueprint_path}")
-        unreal.log_warning(f"⚠️ Please ensure the PCG template blueprint exists before running this script.")
-        unreal.log_warning(f"   Check the path in the manager script (UE_PCG_TEMPLATE_BP_PATH variable).")
+    log.info("\n🔍 Checking if template blueprint exists...")
+    template_asset_data = existing_packages.get(template_package_name)
+    if template_asset_data is None or not template_asset_data.is_valid():
+        log.error(f"❌ Template blueprint not found: {template_blueprint_path}")
+        log.warning(f"⚠️ Please ensure the PCG template blueprint exists before running this script.")
+        log.warning(f"   Check the path in the manager script (UE_PCG_TEMPLATE_BP_PATH variable).")
         return None
     else:
-        unreal.log(f"✅ Template blueprint found at: {template_blueprint_path}")
+        log.info(f"✅ Template blueprint found at: {template_blueprint_path}")
+    log.flush()
     
     # Make sure the destination folder exists
-    unreal.log("\n🔍 Checking if destination folder exists...")
-    if not editor_asset_library.does_directory_exist(destination_folder_path):
-        unreal.log(f"⚠️ Destination folder does not exist: {destination_folder_path}")
-        unreal.log(f"   Attempting to create the folder...")
+    log.info("\n🔍 Checking if destination folder exists...")
+    if not asset_registry.path_exists(destination_folder_path):
+        log.info(f"⚠️ Destination folder does not exist: {destination_folder_path}")
+        log.info(f"   Attempting to create the folder...")
         try:
-            editor_asset_library.make_directory(destination_folder_path)
-            unreal.log(f"✅ Successfully created destination folder")
+            editor_asset_subsystem.make_directory(destination_folder_path)
+            log.info(f"✅ Successfully created destination folder")
         except Exception as folder_error:
-            unreal.log_error(f"❌ Failed to create destination folder: {folder_error}")
-            unreal.log_warning(f"   Please create the folder manually and try again.")
+            log.error(f"❌ Failed to create destination folder: {folder_error}")
+            log.warning(f"   Please create the folder manually and try again.")
             return None
     else:
-        unreal.log(f"✅ Destination folder exists")
+        log.info(f"✅ Destination folder exists")
+    log.flush()
     
     # Check if the blueprint with this name already exists
-    unreal.log("\n🔍 Checking if blueprint already exists...")
-    if editor_asset_library.does_asset_exist(full_destination_path):
-        unreal.log(f"⚠️ A blueprint with the name '{new_blueprint_name}' already exists")
-        unreal.log(f"   Will attempt to replace it...")
+    log.info("\n🔍 Checking if blueprint already exists...")
+    if full_destination_path in existing_packages:
+        log.info(f"⚠️ A blueprint with the name '{new_blueprint_name}' already exists")
+        log.info(f"   Will attempt to replace it...")
         
         # Try to delete the existing blueprint
         try:
-            editor_asset_library.delete_asset(full_destination_path)
-            unreal.log(f"✅ Successfully deleted existing blueprint")
+            editor_asset_subsystem.delete_asset(full_destination_path)
+            log.info(f"✅ Successfully deleted existing blueprint")
         except Exception as delete_error:
-            unreal.log_error(f"❌ Failed to delete existing blueprint: {delete_error}")
-            unreal.log_warning(f"   Will attempt to proceed anyway, but this may cause issues.")
+            log.error(f"❌ Failed to delete existing blueprint: {delete_error}")
+            log.warning(f"   Will attempt to proceed anyway, but this may cause issues.")
+    
+    log.flush()
     
     # Now let's duplicate the blueprint asset
-    unreal.log("\n🌟 Creating new PCG blueprint...")
+    log.info("\n🌟 Creating new PCG blueprint...")
     try:
-        # Load the template blueprint asset
-        template_asset = editor_asset_library.load_asset(template_blueprint_path)
-        if not template_asset:
-            unreal.log_error(f"❌ Failed to load template blueprint: {template_blueprint_path}")
-            return None
-        
-        # Duplicate the template blueprint
-        unreal.log(f"Duplicating template blueprint...")
-        new_blueprint_asset = asset_tools_helper.duplicate_asset(
-            asset_name=new_blueprint_name,
-            package_path=destination_folder_path,
-            original_object=template_asset
-        )
+        # Group the duplicate, spawn and save into one editor transaction
+        # so the editor only refreshes once for the whole operation
+        with unreal.ScopedEditorTransaction("Create PCG Blueprint"):
+            # Duplicate the template blueprint by path
+            # We don't load the template ourselves - the editor only needs its package to copy it
+            # The registry caches lookups while we create the asset instead of rescanning per change
+            # (restoring the previous mode afterwards, in case the editor or a caller already had it on)
+            log.info(f"Duplicating template blueprint...")
+            previous_caching_mode = asset_registry.get_temporary_caching_mode()
+            asset_registry.set_temporary_caching_mode(True)
+            try:
+                new_blueprint_asset = editor_asset_subsystem.duplicate_asset(
+                    template_blueprint_path,
+                    full_destination_path
+                )
+            finally:
+                asset_registry.set_temporary_caching_mode(previous_caching_mode)
         
-        # Verify the duplication was successful
-        if not new_blueprint_asset:
-            unreal.log_error(f"❌ Failed to duplicate blueprint from {template_blueprint_path} to {full_destination_path}")
-            return None
+            # Verify the duplication was successful
+            if not new_blueprint_asset:
+                log.error(f"❌ Failed to duplicate blueprint from {template_blueprint_path} to {full_destination_path}")
+                return None
             
-        unreal.log(f"✅ Successfully created new PCG blueprint: {full_destination_path}")
+            log.info(f"✅ Successfully created new PCG blueprint: {full_destination_path}")
+            log.flush()
         
-        # Now let's place the blueprint in the current level
-        unreal.log("\n🌎 Placing PCG actor in the current level...")
-        try:
-            # First check if we have an open level
-            if not unreal.EditorLevelLibrary.get_editor_world():
-                unreal.log_warning(f"⚠️ No level is currently open. Cannot place actor.")
-                unreal.log_warning(f"   Please open a level and add the PCG actor manually.")
-                return new_blueprint_asset
+            # Now let's place the blueprint in the current level
+            log.info("\n🌎 Placing PCG actor in the current level...")
+            try:
+                # First check if we have an open level
+                if not unreal_editor_subsystem.get_editor_world():
+                    log.warning(f"⚠️ No level is currently open. Cannot place actor.")
+                    log.warning(f"   Please open a level and add the PCG actor manually.")
+                    return new_blueprint_asset
             
-            # Spawn the blueprint at the world origin with default rotation
-            unreal.log(f"Spawning actor at world origin (0,0,0)...")
-            spawned_actor = unreal.EditorLevelLibrary.spawn_actor_from_object(
-                new_blueprint_asset, 
-                unreal.Vector(0, 0, 0),  # Position at origin
-                unreal.Rotator(0, 0, 0)   # Default rotation
-            )
+                # Spawn the blueprint's generated class at the world origin with default rotation
+                # (spawning from the class skips resolving it from the Blueprint asset at spawn time)
+                log.info(f"Spawning actor at world origin (0,0,0)...")
+                blueprint_class = new_blueprint_asset.generated_class()
+                spawned_actor = editor_actor_subsystem.spawn_actor_from_class(
+                    blueprint_class, 
+                    unreal.Vector(0, 0, 0),  # Position at origin
+                    unreal.Rotator(0, 0, 0)   # Default rotation
+                )
             
-            # Verify the actor was spawned successfully
-            if spawned_actor:
-                unreal.log(f"✅ Successfully placed new PCG actor '{new_blueprint_name}' in the current level.")
-                unreal.log(f"   The actor is positioned at the world origin (0,0,0).")
-                unreal.log(f"   You may need to move it to the desired location.")
-            else:
-                unreal.log_error(f"⚠️ Failed to place PCG actor in the level. You may need to add it manually.")
-                unreal.log_warning(f"   To add it manually, drag the blueprint from the Content Browser to the level.")
+                # Verify the actor was spawned successfully
+                if spawned_actor:
+                    log.info(f"✅ Successfully placed new PCG actor '{new_blueprint_name}' in the current level.")
+                    log.info(f"   The actor is positioned at the world origin (0,0,0).")
+                    log.info(f"   You may need to move it to the desired location.")
+                else:
+                    log.error(f"⚠️ Failed to place PCG actor in the level. You may need to add it manually.")
+                    log.warning(f"   To add it manually, drag the blueprint from the Content Browser to the level.")
                 
-        except Exception as spawn_error:
-            unreal.log_error(f"❌ Error while placing PCG actor in level: {spawn_error}")
-            unreal.log_warning(f"⚠️ The blueprint was created successfully, but couldn't be placed in the level.")
-            unreal.log_warning(f"   To add it manually, drag the blueprint from the Content Browser to the level.")
+            except Exception as spawn_error:
+                log.error(f"❌ Error while placing PCG actor in level: {spawn_error}")
+                log.warning(f"⚠️ The blueprint was created successfully, but couldn't be placed in the level.")
+                log.warning(f"   To add it manually, drag the blueprint from the Content Browser to the level.")
+            
+            log.flush()
         
-        # Save all assets to ensure the changes are persisted
-        unreal.log("\n💾 Saving assets...")
-        try:
-            unreal.EditorAssetLibrary.save_loaded_assets([new_blueprint_asset], True)
-            unreal.log(f"✅ Successfully saved all assets")
-        except Exception as save_error:
-            unreal.log_warning(f"⚠️ Failed to save assets: {save_error}")
-            unreal.log_warning(f"   You may need to save manually.")
+            # Save all assets to ensure the changes are persisted
+            log.info("\n💾 Saving assets...")
+            try:
+                editor_asset_subsystem.save_loaded_assets([new_blueprint_asset], only_if_is_dirty=True)
+                log.info(f"✅ Successfully saved all assets")
+            except Exception as save_error:
+                log.warning(f"⚠️ Failed to save assets: {save_error}")
+                log.warning(f"   You may need to save manually.")
             
-        return new_blueprint_asset
+            log.flush()
+            return new_blueprint_asset
         
     except Exception as duplication_error:
-        unreal.log_error(f"❌ Error during blueprint creation: {duplication_error}")
+        log.error(f"❌ Error during blueprint creation: {duplication_error}")
         import traceback
-        unreal.log_error(f"   Error details: {traceback.format_exc()}")
+        log.error(f"   Error details: {traceback.format_exc()}")
         return None
 
 # ======================================================================
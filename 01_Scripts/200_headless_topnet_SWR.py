@@ -35,293 +35,741 @@ Parameters:
 --rop_fbx_sidewalks_path: Output path for the sidewalks FBX file
 --iteration_number: Iteration number to use for finding the correct spline JSON file
 --switch_bool: Controls behavior of the network (usually 0 for this script)
+--debug: List the nodes in /obj and the possible TOPnets when the TOPnet can't be found,
+         and log the parameters that were left unchanged
 --base_path: Base path for the splines JSON files (without iteration number and extension)
+--iterations: Comma-separated iteration numbers to cook after a single .hip load (e.g. "0,1,2").
+              Put {iteration} in the FBX output paths so each iteration gets its own files,
+              and in --file1_path so each iteration reads its own input file.
+--max_inflight: Maximum number of work items the local scheduler cooks at the same time
+--wait_mode: How to wait for the cook - "event" (default), "blocking" or "poll"
+--max_wait_time: Give up on a cook after this many seconds (default: wait until it finishes)
+--server: Keep the .hip file loaded and cook one iteration per JSON line read from stdin
+--rop_fallback: Render the FBX ROPs directly (outside PDG) when a successful TOP cook didn't write their files
+--no_atomic_output: Write the FBX files in place instead of to a .tmp file that is renamed when the cook is done
 """
 
-import hou
 import os
 import time
 import argparse
+import functools
+import dataclasses
+import re
+import logging
+import sys
+import json
+
+from houdini_headless_utils import (
+    configure_logging, cook_topnet, deferred_updates, ensure_output_directories, flush_log,
+    limit_scheduler_slots, normalize_path, set_python_code
+)
+
+# All output goes through this logger; the handler is set up when the script is run directly
+log = logging.getLogger('swr')
+
+# Where the FBX ROPs live in the sidewalks & roads .hip file
+ROAD_ROP_PATH = '/obj/geo1/rop_fbx_road'
+SIDEWALKS_ROP_PATH = '/obj/geo1/rop_fbx_sidewalks'
+SPLINE_IMPORT_PATH = '/obj/geo1/python_import_splines_from_json'
+INPUT_FILE_PATH = '/obj/geo1/file1'
+
+# How many nodes the TOPnet-not-found diagnostic lists before truncating
+MAX_LISTED_NODES = 20
+
+# Patterns used to rewrite the spline import node's Python code when it has no
+# matching parameters - compiled once here instead of on every substitution
+BASE_PATH_RE = re.compile(r'base_path\s*=\s*[\'\"](.*?)[\'\"](.*)')
+SPLINES_PATH_RE = re.compile(r'splines_path\s*=\s*[\'\"](.*?)[\'\"](.*)')
+ITERATION_NUMBER_RE = re.compile(r'iteration_number\s*=\s*(\d+)')
 
 # Set up our command-line argument parser
 # This allows us to control the script's behavior from the command line
-print("Setting up command-line arguments...")
-parser = argparse.ArgumentParser(description='Generate sidewalks and roads using Houdini TOPnet')
-
-# Required arguments
-parser.add_argument('--hip', required=True, 
-                   help='Path to the Houdini .hip file containing the sidewalks & roads setup')
-
-# Optional arguments with sensible defaults
-parser.add_argument('--topnet', default="/obj/geo1/topnet", 
-                   help='Path to the TOPnet node that will be cooked (default: /obj/geo1/topnet)')
-                   
-# Input paths - these will be provided by the manager script
-parser.add_argument('--file1_path', default=None, 
-                   help="Path to the input file (usually not needed for sidewalks & roads)")
-parser.add_argument('--base_path', default=None,
-                   help="Base path for the splines JSON files (without iteration number and extension)")
-                   
-# Output paths - these should be provided by the manager script rather than hardcoded
-parser.add_argument('--rop_fbx_road_path', default=None, 
-                   help="Output path for the road FBX file")
-parser.add_argument('--rop_fbx_sidewalks_path', default=None, 
-                   help="Output path for the sidewalks FBX file")
-                   
-# Pipeline control parameters
-parser.add_argument('--iteration_number', type=int, default=None, 
-                   help="Iteration number used to find the correct spline JSON file")
-parser.add_argument('--switch_bool', type=int, default=0, 
-                   help="Controls behavior of the network (usually 0 for this script)")
-                   
-# Parse the arguments
-args = parser.parse_args()
-
-# Validate required arguments that don't have defaults
-if args.rop_fbx_road_path is None:
-    print("WARNING: No road FBX output path specified. Output may not be saved correctly.")
-if args.rop_fbx_sidewalks_path is None:
-    print("WARNING: No sidewalks FBX output path specified. Output may not be saved correctly.")
-
-# Print a nice header and summary of the arguments
-print("\n" + "*" * 80)
-print("🛣️  STARTING HOUDINI SIDEWALKS & ROADS GENERATION")
-print("*" * 80)
-
-# Print a summary of the arguments
-print("\nRunning with the following settings:")
-print(f"  • Houdini File: {args.hip}")
-print(f"  • TOPnet Path: {args.topnet}")
-print(f"  • Input File: {args.file1_path if args.file1_path else 'Not specified'}")
-print(f"  • Splines Base Path: {args.base_path if args.base_path else 'Not specified'}")
-print(f"  • Output Road FBX: {args.rop_fbx_road_path if args.rop_fbx_road_path else 'Not specified'}")
-print(f"  • Output Sidewalks FBX: {args.rop_fbx_sidewalks_path if args.rop_fbx_sidewalks_path else 'Not specified'}")
-print(f"  • Iteration Number: {args.iteration_number if args.iteration_number is not None else 'Not specified'}")
-print(f"  • Switch Bool: {args.switch_bool}")
-print()
+def parse_args(argv=None):
+    """Parse the command-line arguments for the sidewalks & roads generation"""
+    parser = argparse.ArgumentParser(description='Generate sidewalks and roads using Houdini TOPnet')
+
+    # Required arguments
+    parser.add_argument('--hip', required=True, 
+                       help='Path to the Houdini .hip file containing the sidewalks & roads setup')
+
+    # Optional arguments with sensible defaults
+    parser.add_argument('--topnet', default="/obj/geo1/topnet", 
+                       help='Path to the TOPnet node that will be cooked (default: /obj/geo1/topnet)')
+                       
+    # Input paths - these will be provided by the manager script
+    parser.add_argument('--file1_path', default=None, 
+                       help="Path to the input file (usually not needed for sidewalks & roads); "
+                            "{iteration} is replaced with the iteration number")
+    parser.add_argument('--base_path', default=None,
+                       help="Base path for the splines JSON files (without iteration number and extension)")
+                       
+    # Output paths - these should be provided by the manager script rather than hardcoded
+    parser.add_argument('--rop_fbx_road_path', default=None, 
+                       help="Output path for the road FBX file")
+    parser.add_argument('--rop_fbx_sidewalks_path', default=None, 
+                       help="Output path for the sidewalks FBX file")
+                       
+    # Pipeline control parameters
+    parser.add_argument('--iteration_number', type=int, default=None, 
+                       help="Iteration number used to find the correct spline JSON file")
+    parser.add_argument('--switch_bool', type=int, default=0, 
+                       help="Controls behavior of the network (usually 0 for this script)")
+    parser.add_argument('--debug', action='store_true',
+                       help="Print extra diagnostics (e.g. every node in /obj) when something can't be found, "
+                            "and log the parameters that were left unchanged")
+    parser.add_argument('--iterations', default=None,
+                       help="Comma-separated iteration numbers to cook in one session (e.g. 0,1,2). "
+                            "The .hip file is loaded once; use {iteration} in the FBX output paths")
+    parser.add_argument('--max_inflight', type=int, default=None,
+                       help="Maximum number of work items the local scheduler cooks at the same time "
+                            "(default: keep the setting saved in the .hip file)")
+    parser.add_argument('--wait_mode', choices=['event', 'poll', 'blocking'], default='event',
+                       help="How to wait for the TOP cook: PDG cook events (default), a blocking cook, or polling")
+    parser.add_argument('--max_wait_time', type=float, default=None,
+                       help="Give up on a cook after this many seconds (default: wait until it finishes)")
+    parser.add_argument('--server', action='store_true',
+                       help="Keep the .hip file loaded and cook one iteration per JSON line read from stdin "
+                            "(e.g. {\"iteration_number\": 3, \"rop_fbx_road_path\": \"...\"}); "
+                            "an empty line or end of input stops the server")
+    parser.add_argument('--rop_fallback', action='store_true',
+                       help="Render the FBX ROPs directly (outside PDG) when a successful TOP cook "
+                            "didn't write their files (off by default)")
+    parser.add_argument('--no_atomic_output', action='store_true',
+                       help="Write the FBX files in place instead of to a .tmp file that is renamed "
+                            "once the cook is done (Unreal may pick up half-written files)")
+                       
+    # Parse the arguments
+    args = parser.parse_args(argv)
+
+    # Normalize all path arguments once, so Houdini gets the same canonical form on every set
+    for path_argument in ('hip', 'file1_path', 'base_path', 'rop_fbx_road_path', 'rop_fbx_sidewalks_path'):
+        setattr(args, path_argument, normalize_path(getattr(args, path_argument)))
+    return args
+
+# Cached node and parameter lookups
+# Each path is resolved once per loaded .hip file instead of walking the scene
+# on every call; the caches are cleared right after the .hip file is loaded.
+# Nodes are looked up as children of their (cached) parent, so /obj/geo1 is only
+# resolved once and every node inside it is a direct child lookup.
+@functools.lru_cache(maxsize=None)
+def _get_node(node_path):
+    """Return the Houdini node at node_path (or None), resolving it only once"""
+    parent_path, _, node_name = node_path.rstrip("/").rpartition("/")
+    if not parent_path:
+        return hou.node(node_path)
+    parent_node = _get_node(parent_path)
+    if parent_node is None:
+        return None
+    return parent_node.node(node_name)
+
+@functools.lru_cache(maxsize=None)
+def _get_parm(node_path, parameter_name):
+    """Return the parameter on the node at node_path (or None), resolving it only once"""
+    node = _get_node(node_path)
+    if node is None:
+        return None
+    return node.parm(parameter_name)
+
+# Helper function to list the scene's TOPnets for the --debug diagnostic
+def list_topnets():
+    """Return the path of every topnet node in the scene, from Houdini's node type index"""
+    topnet_paths = []
+    for category in hou.nodeTypeCategories().values():
+        node_type = category.nodeType("topnet")
+        if node_type is not None:
+            topnet_paths.extend(node.path() for node in node_type.instances())
+    return topnet_paths
 
 # Helper function to set a parameter on a node with better error handling
 def set_node_parameter(node_path, parameter_name, value, description=None):
     """Set a parameter on a Houdini node with better error handling and logging"""
     if value is None:
-        print(f"Skipping {node_path}.{parameter_name} (no value provided)")
+        log.debug("Skipping %s.%s (no value provided)", node_path, parameter_name)
         return False
         
     # Get the node
-    node = hou.node(node_path)
+    node = _get_node(node_path)
     if node is None:
-        print(f"⚠️ WARNING: Could not find node {node_path}")
+        log.warning(f"⚠️ WARNING: Could not find node {node_path}")
         return False
         
     # Get the parameter
-    parm = node.parm(parameter_name)
+    parm = _get_parm(node_path, parameter_name)
     if parm is None:
-        print(f"⚠️ WARNING: Parameter '{parameter_name}' not found on {node_path}")
+        log.warning(f"⚠️ WARNING: Parameter '{parameter_name}' not found on {node_path}")
         return False
         
-    # Set the parameter value (convert to string to avoid type errors)
-    parm.set(str(value))
+    return set_parm_value(parm, value, description or f"Set {node_path}.{parameter_name}")
+
+# Helper function to set a parameter we already hold a handle to
+def set_parm_value(parm, value, description):
+    """Set an already resolved parameter, skipping values it already holds"""
+    if value is None:
+        log.debug("Skipping %s (no value provided)", parm.path())
+        return False
+    
+    # Setting a parm always dirties everything downstream of it, so leave
+    # parameters that already hold this value alone (compared as text to avoid int/str mismatches)
+    if str(parm.eval()) == str(value):
+        log.debug("✅ %s already set to: %s", parm.path(), value)
+        return True
+    
+    # Set the parameter value with its native type so int/float parms don't re-parse a string
+    # (string parameters still get the value as text)
+    if parm.parmTemplate().dataType() == hou.parmData.String:
+        parm.set(str(value))
+    else:
+        parm.set(value)
     
     # Log the success
-    desc = description or f"Set {node_path}.{parameter_name}"
-    print(f"✅ {desc}: {value}")
+    log.info(f"✅ {description}: {value}")
     return True
 
-# Load the Houdini file
-print("\n🔄 Loading Houdini file...")
-hip_file_path = args.hip
-
-# Check if the hip file exists before attempting to load it
-if not os.path.exists(hip_file_path):
-    print(f"❌ ERROR: Houdini file not found at: {hip_file_path}")
-    print("Please check the path and make sure the file exists.")
-    exit(1)
+# Handles to everything cook_iteration() touches
+# These are resolved once after the .hip file is loaded, so the iteration loop
+# works directly on node/parm objects instead of looking paths up every time
+@dataclasses.dataclass
+class SceneRefs:
+    """Node and parameter handles reused by every iteration (None where the .hip file has no match)"""
+    topnet_node: object
+    output_node: object
+    road_sopoutput: object = None
+    sidewalks_sopoutput: object = None
+    iteration_parm: object = None
+    python_code_parm: object = None
+    input_file_parm: object = None
+
+# Helper function to give the spline import node a real iteration_number parameter
+# Rewriting the Python code every iteration makes Houdini re-parse the SOP each time, so when
+# the node only has the number hard-coded we add a spare parm once and point the code at it;
+# after that every iteration is a plain parameter set
+def add_iteration_spare_parm(python_code_parm):
+    """Add an iteration_number spare parm read by the node's Python code, returning it (or None)"""
+    if python_code_parm is None:
+        return None
+    current_code = python_code_parm.eval()
+    match = ITERATION_NUMBER_RE.search(current_code)
+    if not match:
+        return None
     
-try:
-    hou.hipFile.load(hip_file_path)
-    print(f"✅ Successfully loaded: {hip_file_path}")
-except Exception as e:
-    print(f"❌ ERROR loading hip file: {str(e)}")
-    print("Please check that the file is a valid Houdini .hip file and is not corrupted.")
-    exit(1)
-
-# Now let's configure all the nodes with our parameters
-print("\n🔧 Configuring Houdini nodes...")
-
-# 1. Set the input file path (if provided)
-set_node_parameter(
-    '/obj/geo1/file1', 'file', args.file1_path,
-    "Set input file path"
-)
-
-# 2. Set the output paths for the FBX files
-# Set road FBX output path
-set_node_parameter(
-    '/obj/geo1/rop_fbx_road', 'sopoutput', args.rop_fbx_road_path,
-    "Set road FBX output path"
-)
-
-# Set sidewalks FBX output path
-set_node_parameter(
-    '/obj/geo1/rop_fbx_sidewalks', 'sopoutput', args.rop_fbx_sidewalks_path,
-    "Set sidewalks FBX output path"
-)
-
-# 3. Set the base_path parameter for the spline import
-print("\n📚 Setting parameters for spline import...")
-set_node_parameter(
-    '/obj/geo1/python_import_splines_from_json', 'base_path', args.base_path,
-    "Set base path for spline import"
-)
-
-# If direct parameter setting failed, try to modify the Python code
-if args.base_path is not None and not hou.node('/obj/geo1/python_import_splines_from_json').parm('base_path'):
-    python_node = hou.node('/obj/geo1/python_import_splines_from_json')
-    if python_node is not None:
-        python_code_parm = python_node.parm('python')
-        if python_code_parm is not None:
-            current_code = python_code_parm.eval()
-            # Look for a line defining base_path or splines_path
-            if 'base_path' in current_code:
-                # Replace the line with our new value
-                import re
-                new_code = re.sub(r'base_path\s*=\s*[\'\"](.*?)[\'\"](.*)', f'base_path = "{args.base_path}"\2', current_code)
-                python_code_parm.set(new_code)
-                print(f"✅ Modified Python code to set base_path to: {args.base_path}")
-            elif 'splines_path' in current_code:
-                # It might be called splines_path instead
-                new_code = re.sub(r'splines_path\s*=\s*[\'\"](.*?)[\'\"](.*)', f'splines_path = "{args.base_path}"\2', current_code)
-                python_code_parm.set(new_code)
-                print(f"✅ Modified Python code to set splines_path to: {args.base_path}")
+    try:
+        python_node = python_code_parm.node()
+        parm_template_group = python_node.parmTemplateGroup()
+        # Default to the number that was hard-coded, so a run without an iteration number cooks the same iteration as before
+        parm_template_group.append(hou.IntParmTemplate('iteration_number', 'Iteration Number', 1, default_value=(int(match.group(1)),)))
+        python_node.setParmTemplateGroup(parm_template_group)
+        new_code = ITERATION_NUMBER_RE.sub("iteration_number = hou.pwd().evalParm('iteration_number')", current_code, count=1)
+        set_python_code(python_code_parm, current_code, new_code, "iteration_number from its new spare parameter")
+        return python_node.parm('iteration_number')
+    except hou.Error as e:
+        log.warning(f"⚠️ WARNING: Could not add an iteration_number parameter to {SPLINE_IMPORT_PATH}: {e}")
+        return None
+
+# Helper function to resolve the per-iteration handles once
+def resolve_scene_refs(topnet_node, output_node):
+    """Return a SceneRefs with the ROP output and spline import parameters for this .hip file"""
+    refs = SceneRefs(
+        topnet_node=topnet_node,
+        output_node=output_node,
+        road_sopoutput=_get_parm(ROAD_ROP_PATH, 'sopoutput'),
+        sidewalks_sopoutput=_get_parm(SIDEWALKS_ROP_PATH, 'sopoutput'),
+        iteration_parm=_get_parm(SPLINE_IMPORT_PATH, 'iteration_number'),
+        python_code_parm=_get_parm(SPLINE_IMPORT_PATH, 'python'),
+        input_file_parm=_get_parm(INPUT_FILE_PATH, 'file'),
+    )
+    
+    # Without an iteration_number parameter, set one up now instead of editing the code every iteration
+    if refs.iteration_parm is None:
+        refs.iteration_parm = add_iteration_spare_parm(refs.python_code_parm)
+    
+    # Warn about missing ROP outputs once, instead of on every iteration
+    if refs.road_sopoutput is None:
+        log.warning("⚠️ WARNING: Could not find the road FBX ROP output parameter")
+    if refs.sidewalks_sopoutput is None:
+        log.warning("⚠️ WARNING: Could not find the sidewalks FBX ROP output parameter")
+    return refs
+
+# Helper function to load the .hip file and reset the node caches
+def load_hip_file(hip_file_path):
+    """Load the Houdini file, exiting with an error if it can't be loaded"""
+    log.info("\n🔄 Loading Houdini file...")
+    try:
+        hou.hipFile.load(hip_file_path, suppress_save_prompt=True, ignore_load_warnings=True)
+        _get_node.cache_clear()
+        _get_parm.cache_clear()
+        log.info(f"✅ Successfully loaded: {hip_file_path}")
+    except Exception as e:
+        log.error(f"❌ ERROR loading hip file: {str(e)}")
+        log.info("Please check that the file is a valid Houdini .hip file and is not corrupted.")
+        sys.exit(1)
+
+# Helper function to work out the FBX output path for a given iteration
+def resolve_output_path(path, iteration_number):
+    """Replace the {iteration} placeholder in an output (or input) path with the iteration number"""
+    if path is None or iteration_number is None:
+        return path
+    return path.replace("{iteration}", str(iteration_number))
+
+# Helper function to tell whether a path changes with the iteration
+def is_per_iteration_path(path):
+    """Return True if path contains the {iteration} placeholder"""
+    return path is not None and "{iteration}" in path
+
+# Helper function to configure the nodes shared by every iteration
+def apply_params(args):
+    """Set the input file, spline base path and switch_bool parameters (once per session)"""
+    log.info("\n🔧 Configuring Houdini nodes...")
+
+    # 1. Set the input file path (if provided)
+    # A path with {iteration} in it is set by cook_iteration() instead, once per iteration
+    if is_per_iteration_path(args.file1_path):
+        log.info(f"Input file path changes per iteration: {args.file1_path}")
+    else:
+        set_node_parameter(
+            INPUT_FILE_PATH, 'file', args.file1_path,
+            "Set input file path"
+        )
+
+    # 2. Set the base_path parameter for the spline import
+    log.info("\n📚 Setting parameters for spline import...")
+    base_path_set = set_node_parameter(
+        SPLINE_IMPORT_PATH, 'base_path', args.base_path,
+        "Set base path for spline import"
+    )
+
+    # If direct parameter setting failed, try to modify the Python code
+    if args.base_path is not None and not base_path_set:
+        python_node = _get_node(SPLINE_IMPORT_PATH)
+        if python_node is not None:
+            python_code_parm = _get_parm(SPLINE_IMPORT_PATH, 'python')
+            if python_code_parm is not None:
+                current_code = python_code_parm.eval()
+                # Look for a line defining base_path or splines_path
+                if 'base_path' in current_code:
+                    # Replace the line with our new value
+                    new_code = BASE_PATH_RE.sub(lambda match: f'base_path = "{args.base_path}"{match.group(2)}', current_code)
+                    set_python_code(python_code_parm, current_code, new_code, f"base_path to: {args.base_path}")
+                elif 'splines_path' in current_code:
+                    # It might be called splines_path instead
+                    new_code = SPLINES_PATH_RE.sub(lambda match: f'splines_path = "{args.base_path}"{match.group(2)}', current_code)
+                    set_python_code(python_code_parm, current_code, new_code, f"splines_path to: {args.base_path}")
+                else:
+                    log.warning("⚠️ WARNING: Could not find 'base_path' or 'splines_path' in the Python code to modify")
             else:
-                print("⚠️ WARNING: Could not find 'base_path' or 'splines_path' in the Python code to modify")
-        else:
-            print("⚠️ WARNING: Could not access Python code parameter in the node")
-
-# 4. Set the iteration_number parameter for the spline import
-print("\n🔢 Setting iteration number...")
-set_node_parameter(
-    '/obj/geo1/python_import_splines_from_json', 'iteration_number', args.iteration_number,
-    "Set iteration number for spline import"
-)
-
-# If direct parameter setting failed, try to modify the Python code
-if args.iteration_number is not None and not set_node_parameter('/obj/geo1/python_import_splines_from_json', 'iteration_number', args.iteration_number, None):
-    python_node = hou.node('/obj/geo1/python_import_splines_from_json')
-    if python_node is not None:
-        python_code_parm = python_node.parm('python')
+                log.warning("⚠️ WARNING: Could not access Python code parameter in the node")
+
+    # 3. Set the switch_bool parameter to control network behavior
+    log.info("\n🔍 Setting switch_bool parameter...")
+    set_node_parameter(
+        '/obj/geo1/switch_bool', 'input', args.switch_bool,
+        f"Set switch_bool to {args.switch_bool}"
+    )
+
+# Helper function to set the iteration number on the spline import node
+def set_iteration_number(refs, iteration_number):
+    """Set the iteration number parameter, falling back to editing the node's Python code"""
+    log.info("\n🔢 Setting iteration number...")
+    iteration_number_set = False
+    if refs.iteration_parm is not None:
+        iteration_number_set = set_parm_value(
+            refs.iteration_parm, iteration_number,
+            "Set iteration number for spline import"
+        )
+    else:
+        log.warning(f"⚠️ WARNING: Parameter 'iteration_number' not found on {SPLINE_IMPORT_PATH}")
+
+    # If direct parameter setting failed, try to modify the Python code
+    if iteration_number is not None and not iteration_number_set:
+        python_code_parm = refs.python_code_parm
         if python_code_parm is not None:
             current_code = python_code_parm.eval()
             # Look for a line defining iteration_number
             if 'iteration_number' in current_code:
                 # Replace the line with our new value
-                import re
-                new_code = re.sub(r'iteration_number\s*=\s*\d+', f'iteration_number = {args.iteration_number}', current_code)
-                python_code_parm.set(new_code)
-                print(f"✅ Modified Python code to set iteration_number to: {args.iteration_number}")
+                new_code, replaced = ITERATION_NUMBER_RE.subn(f'iteration_number = {iteration_number}', current_code)
+                if replaced:
+                    set_python_code(python_code_parm, current_code, new_code, f"iteration_number to: {iteration_number}")
+                else:
+                    log.warning("⚠️ WARNING: Found 'iteration_number' in the Python code but no assignment to replace")
             else:
-                print("⚠️ WARNING: Could not find 'iteration_number' in the Python code to modify")
+                log.warning("⚠️ WARNING: Could not find 'iteration_number' in the Python code to modify")
         else:
-            print("⚠️ WARNING: Could not access Python code parameter in the node")
-
-# 5. Set the switch_bool parameter to control network behavior
-print("\n🔍 Setting switch_bool parameter...")
-set_node_parameter(
-    '/obj/geo1/switch_bool', 'input', args.switch_bool,
-    f"Set switch_bool to {args.switch_bool}"
-)
-
-# Now let's find and cook the TOPnet
-print("\n🍳 Preparing to cook the TOP network...")
-topnet_path = args.topnet
-print(f"Looking for TOPnet at: {topnet_path}")
+            log.warning("⚠️ WARNING: Could not access Python code parameter in the node")
+
+# Helper function to find the TOPnet and the node it cooks
+def find_topnet(topnet_path, debug=False):
+    """Return (topnet_node, output_node) for the TOPnet at topnet_path, exiting if it can't be cooked"""
+    log.info("\n🍳 Preparing to cook the TOP network...")
+    log.info(f"Looking for TOPnet at: {topnet_path}")
+
+    # Find the TOPnet node
+    topnet_node = _get_node(topnet_path)
+    if not topnet_node:
+        log.error(f"❌ ERROR: TOP network not found at {topnet_path}")
+        
+        # List the nodes in /obj and the networks that might be TOPnets to help debugging
+        # (only with --debug, since this creates a Python wrapper for every node in /obj)
+        if debug:
+            obj_paths = [node.path() for node in _get_node("/obj").children()]
+            log.error("Available nodes in /obj (%d): %s", len(obj_paths), ", ".join(obj_paths[:MAX_LISTED_NODES]))
+            topnet_paths = list_topnets()
+            log.info("\nPossible TOPnets:\n" + "\n".join(f"  • {path}" for path in topnet_paths))
+        else:
+            log.info("Run with --debug to list the nodes in /obj and the possible TOPnets")
+            
+        log.info("\nPlease check the --topnet argument and make sure it points to a valid TOP network.")
+        sys.exit(1)
+
+    log.info(f"✅ Found TOPnet: {topnet_node.path()}")
+
+    # Find the node the TOP network cooks (the one with the display flag)
+    log.info("Looking for the TOPnet output (display) node...")
+    output_node = topnet_node.displayNode()
+    if not output_node:
+        log.error("❌ ERROR: No display node found inside the TOPnet")
+        
+        # List available TOP nodes to help debugging
+        log.info("\nAvailable nodes in the TOPnet:\n" + "\n".join(f"  • {node.path()}" for node in topnet_node.children()))
+            
+        log.info("\nThe TOPnet might not be properly configured for cooking.")
+        sys.exit(1)
+
+    log.info(f"✅ Found output node: {output_node.path()}")
+
+    # Make sure PDG has a graph context for this network - this is available as soon as the
+    # .hip file is loaded, so there is no need to wait before starting the cook
+    if output_node.getPDGGraphContext() is None:
+        log.error("❌ ERROR: No PDG graph context available for the TOPnet")
+        log.info("\nThe TOPnet might not be properly configured for cooking.")
+        sys.exit(1)
+
+    log.info("✅ PDG graph context is ready")
+    return topnet_node, output_node
+
+# Helper function to stat an output file with a single syscall
+def stat_output_file(path):
+    """Return os.stat() for path, or None if no path was given or the file doesn't exist"""
+    if not path:
+        return None
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+# Helper function to render the FBX ROPs whose files the TOP cook didn't write
+def render_missing_outputs(road_fbx_path, sidewalks_fbx_path):
+    """
+    Render the road/sidewalks FBX ROPs whose output file is still missing after the cook.
+    
+    This bypasses PDG: hou.render() renders the ROPs one after another with the current
+    parameter values. It's only used with --rop_fallback, and only after a cook that finished
+    without errors. Returns the number of ROPs that were rendered.
+    """
+    missing_rops = []
+    for rop_path, fbx_path in ((ROAD_ROP_PATH, road_fbx_path),
+                               (SIDEWALKS_ROP_PATH, sidewalks_fbx_path)):
+        if not fbx_path or stat_output_file(fbx_path) is not None:
+            continue
+        rop_node = _get_node(rop_path)
+        if rop_node is not None:
+            missing_rops.append(rop_node)
+    
+    if not missing_rops:
+        return 0
+    
+    log.info(f"\n📦 Rendering {len(missing_rops)} FBX ROP(s) the TOP cook didn't write...")
+    start_time = time.monotonic()
+    hou.render(missing_rops)
+    log.info(f"✅ Rendered {', '.join(rop_node.name() for rop_node in missing_rops)} ({time.monotonic() - start_time:.1f}s)")
+    return len(missing_rops)
+
+# Helper function to report on the generated FBX files
+def check_output_files(road_fbx_path, sidewalks_fbx_path):
+    """Print whether the road and sidewalks FBX files were written, with their sizes and modification times"""
+    log.info("\n💾 Checking for output files...")
+    road_stat = stat_output_file(road_fbx_path)
+    if road_stat is not None:
+        modified = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(road_stat.st_mtime))
+        log.info(f"✅ Road FBX file created: {road_fbx_path} ({road_stat.st_size/1024:.1f} KB, modified {modified})")
+    else:
+        log.warning(f"⚠️ Road FBX file not found or not specified at: {road_fbx_path}")
+        log.info("  Check that the output path is correct and that the TOP network is configured properly.")
+        
+    sidewalks_stat = stat_output_file(sidewalks_fbx_path)
+    if sidewalks_stat is not None:
+        modified = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(sidewalks_stat.st_mtime))
+        log.info(f"✅ Sidewalks FBX file created: {sidewalks_fbx_path} ({sidewalks_stat.st_size/1024:.1f} KB, modified {modified})")
+    else:
+        log.warning(f"⚠️ Sidewalks FBX file not found or not specified at: {sidewalks_fbx_path}")
+        log.info("  Check that the output path is correct and that the TOP network is configured properly.")
+
+# Helper function to work out where the FBX ROPs should write during the cook
+def temporary_output_path(path):
+    """Return the sibling .tmp path the FBX ROP writes to before it's renamed to path"""
+    if not path:
+        return path
+    return path + ".tmp"
+
+# Helper function to move finished FBX files into place
+def publish_output_file(temporary_path, final_path):
+    """Atomically rename a finished .tmp output to its final path, so readers never see a partial file"""
+    if not temporary_path or temporary_path == final_path:
+        return False
+    try:
+        os.replace(temporary_path, final_path)
+    except FileNotFoundError:
+        return False
+    return True
 
-# Find the TOPnet node
-topnet_node = hou.node(topnet_path)
-if not topnet_node:
-    print(f"❌ ERROR: TOP network not found at {topnet_path}")
+# Helper function to throw away the .tmp output of a failed or interrupted cook
+def discard_output_file(temporary_path, final_path):
+    """Delete a .tmp output without touching final_path (a no-op when writing in place)"""
+    if not temporary_path or temporary_path == final_path:
+        return
+    try:
+        os.remove(temporary_path)
+    except FileNotFoundError:
+        pass
+
+# Helper function to cook a single iteration against the already loaded .hip file
+def cook_iteration(args, refs, iteration_number):
+    """Point the FBX ROPs and spline import at iteration_number, cook, and check the outputs"""
+    road_fbx_path = resolve_output_path(args.rop_fbx_road_path, iteration_number)
+    sidewalks_fbx_path = resolve_output_path(args.rop_fbx_sidewalks_path, iteration_number)
+    
+    # Create this iteration's output folders now that {iteration} is filled in (the startup check
+    # skips those, and in server mode each request can point at new folders)
+    ensure_output_directories((road_fbx_path, sidewalks_fbx_path), exit_on_error=not args.server)
+    
+    # Write to .tmp files during the cook and rename them once they're complete, so a file
+    # watcher (e.g. Unreal's auto-import) never picks up a half-written FBX
+    if args.no_atomic_output:
+        road_write_path, sidewalks_write_path = road_fbx_path, sidewalks_fbx_path
+    else:
+        road_write_path = temporary_output_path(road_fbx_path)
+        sidewalks_write_path = temporary_output_path(sidewalks_fbx_path)
+    
+    # Leftovers from an interrupted run would otherwise look like fresh output
+    discard_output_file(road_write_path, road_fbx_path)
+    discard_output_file(sidewalks_write_path, sidewalks_fbx_path)
     
-    # List available nodes to help debugging
-    print("\nAvailable nodes in /obj:")
-    for node in hou.node("/obj").children():
-        print(f"  • {node.path()}")
+    # Apply this iteration's parameters as one change before cooking
+    with deferred_updates():
+        # Set the output paths for the FBX files
+        # Set road FBX output path
+        if refs.road_sopoutput is not None:
+            set_parm_value(refs.road_sopoutput, road_write_path, "Set road FBX output path")
         
-    # List available networks that might be TOPnets
-    print("\nPossible TOPnets:")
-    for node in hou.nodeType(hou.topNodeType()).instances():
-        print(f"  • {node.path()}")
+        # Set sidewalks FBX output path
+        if refs.sidewalks_sopoutput is not None:
+            set_parm_value(refs.sidewalks_sopoutput, sidewalks_write_path, "Set sidewalks FBX output path")
         
-    print("\nPlease check the --topnet argument and make sure it points to a valid TOP network.")
-    exit(1)
-
-print(f"✅ Found TOPnet: {topnet_node.path()}")
-
-# Check if the cookbutton parameter exists
-print("Looking for the 'cookbutton' parameter...")
-cookbutton = topnet_node.parm("cookbutton")
-if not cookbutton:
-    print("❌ ERROR: 'cookbutton' parameter not found on the TOPnet node")
+        # Set this iteration's input file (only when the path contains {iteration})
+        if is_per_iteration_path(args.file1_path):
+            if refs.input_file_parm is not None:
+                set_parm_value(refs.input_file_parm, resolve_output_path(args.file1_path, iteration_number), "Set input file path")
+            else:
+                log.warning(f"⚠️ WARNING: Parameter 'file' not found on {INPUT_FILE_PATH}")
+        
+        # Set the iteration number for the spline import
+        set_iteration_number(refs, iteration_number)
     
-    # List available parameters to help debugging
-    print("\nAvailable parameters on the TOPnet node:")
-    for parm in topnet_node.parms():
-        print(f"  • {parm.name()}: {parm.description()}")
+    # Cook the TOPnet and wait until all work items are done (see --wait_mode)
+    # This returns as soon as PDG reports the cook as finished, instead of sleeping
+    # for a fixed amount of time that is either too long or too short for the scene
+    try:
+        log.info("\n🔥 Starting the cooking process...")
+        start_time = time.monotonic()
         
-    print("\nThe TOPnet might not be properly configured for cooking.")
-    exit(1)
-
-print("✅ Found 'cookbutton' parameter")
-
-# Cook the TOPnet by pressing the cookbutton
-try:
-    print("\n🔥 Starting the cooking process...")
+        # Dirty any cached work items first (e.g. from a previous iteration) so stale
+        # results don't pile up in memory alongside the new ones
+        refs.output_node.dirtyAllWorkItems(False)
+        
+        finished, cook_errors = cook_topnet(refs.output_node, args.wait_mode, args.max_wait_time)
+        if not finished:
+            error_message = f"cook did not finish within {args.max_wait_time}s"
+        elif cook_errors:
+            error_message = f"cook reported {len(cook_errors)} error(s)"
+        else:
+            error_message = None
+        
+        elapsed = time.monotonic() - start_time
+        
+    except Exception as e:
+        error_message = str(e)
     
-    # Press the cookbutton to start cooking
-    cookbutton.pressButton()
-    print("✅ Cook button pressed, TOP network execution started")
+    # Never publish the output of a failed cook, it may be partial or stale
+    if error_message is not None:
+        log.error(f"❌ Error cooking TOP network: {error_message}")
+        discard_output_file(road_write_path, road_fbx_path)
+        discard_output_file(sidewalks_write_path, sidewalks_fbx_path)
+        sys.exit(1)
     
-    # Wait for cooking to start
-    print("Waiting for cooking to start (this may take a moment)...")
-    for i in range(3):
-        print(f"  ⏳ {3-i} seconds remaining...")
-        time.sleep(1)
+    log.info(f"✅ TOP network cook completed ({elapsed:.1f}s)")
     
-    # Wait for cooking to complete
-    # Note: We can't easily check if cooking is still in progress in headless mode,
-    # so we just wait a reasonable amount of time
-    print("\nWaiting for cook to complete...")
-    max_wait_time = 120  # 2 minutes
-    start_time = time.time()
-    while time.time() - start_time < max_wait_time:
-        elapsed = int(time.time() - start_time)
-        remaining = max_wait_time - elapsed
-        if remaining % 10 == 0:  # Only print every 10 seconds to reduce noise
-            print(f"  ⏳ Still cooking... ({elapsed}s elapsed, max {max_wait_time}s)")
-        time.sleep(1)
+    # Render any FBX files the TOP cook didn't write (only when asked to)
+    if args.rop_fallback:
+        render_missing_outputs(road_write_path, sidewalks_write_path)
     
-    print("✅ TOP network cook should be completed")
+    # Move the finished files into place
+    publish_output_file(road_write_path, road_fbx_path)
+    publish_output_file(sidewalks_write_path, sidewalks_fbx_path)
     
-except Exception as e:
-    print(f"❌ Error cooking TOP network: {str(e)}")
-    exit(1)
-
-# Check for output files
-print("\n💾 Checking for output files...")
-if args.rop_fbx_road_path and os.path.exists(args.rop_fbx_road_path):
-    file_size = os.path.getsize(args.rop_fbx_road_path)
-    print(f"✅ Road FBX file created: {args.rop_fbx_road_path} ({file_size/1024:.1f} KB)")
-else:
-    print("⚠️ Road FBX file not found or not specified at: {args.rop_fbx_road_path}")
-    print("  Check that the output path is correct and that the TOP network is configured properly.")
+    # Check for output files
+    check_output_files(road_fbx_path, sidewalks_fbx_path)
+
+# Arguments that are applied once per session by apply_params() rather than per iteration
+# (file1_path is only shared when it doesn't contain {iteration})
+SHARED_ARGUMENTS = {'file1_path', 'base_path', 'switch_bool'}
+
+# Helper function to serve iterations from stdin against the already loaded .hip file
+def serve_iterations(args, refs):
+    """
+    Cook one iteration per JSON line read from stdin, keeping the .hip file loaded in between.
     
-if args.rop_fbx_sidewalks_path and os.path.exists(args.rop_fbx_sidewalks_path):
-    file_size = os.path.getsize(args.rop_fbx_sidewalks_path)
-    print(f"✅ Sidewalks FBX file created: {args.rop_fbx_sidewalks_path} ({file_size/1024:.1f} KB)")
-else:
-    print("⚠️ Sidewalks FBX file not found or not specified at: {args.rop_fbx_sidewalks_path}")
-    print("  Check that the output path is correct and that the TOP network is configured properly.")
-
-print("\n🎉 Script completed successfully")
-print("Sidewalks & Roads export has been generated and exported to FBX files.")
-print("The next step is to import these FBX files into Unreal Engine.")
-print("" + "-"*80)
\ No newline at end of file
+    Each line holds the arguments that change for that iteration (e.g. iteration_number and
+    the FBX output paths). A JSON status line is written to stdout after every cook; an empty
+    line or the end of the input stops the server.
+    """
+    log.info("\n📡 Server mode: waiting for iterations on stdin (one JSON object per line)...")
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            break
+        
+        try:
+            request = json.loads(line)
+            iteration_args = argparse.Namespace(**{**vars(args), **request})
+            for path_argument in ('file1_path', 'base_path', 'rop_fbx_road_path', 'rop_fbx_sidewalks_path'):
+                setattr(iteration_args, path_argument, normalize_path(getattr(iteration_args, path_argument)))
+            
+            # Only re-apply the shared parameters when this request actually changes them
+            if SHARED_ARGUMENTS & request.keys():
+                with deferred_updates():
+                    apply_params(iteration_args)
+            
+            cook_iteration(iteration_args, refs, iteration_args.iteration_number)
+            status = {"status": "ok", "iteration_number": iteration_args.iteration_number}
+        except SystemExit as e:
+            # cook_iteration gave up; the reason is already in the log, so point the caller there
+            message = f"iteration failed (exit code {e.code}), see the log for details"
+            log.error(f"❌ Error serving request {line}: {message}")
+            status = {"status": "error", "request": line, "message": message}
+        except Exception as e:
+            # A failed iteration shouldn't stop the server
+            log.error(f"❌ Error serving request {line}: {str(e)}")
+            status = {"status": "error", "request": line, "message": str(e)}
+        
+        # Write out any buffered log lines first, so they stay in order with the status line
+        flush_log()
+        sys.stdout.write(json.dumps(status) + "\n")
+        sys.stdout.flush()
+
+def main(args):
+    """Load the .hip file once, apply the shared parameters and cook every requested iteration"""
+    # Work out which iterations we're cooking in this session
+    if args.iterations:
+        iterations = [int(value) for value in args.iterations.split(",") if value.strip()]
+    else:
+        iterations = [args.iteration_number]
+
+    # Validate required arguments that don't have defaults
+    if args.rop_fbx_road_path is None:
+        log.warning("WARNING: No road FBX output path specified. Output may not be saved correctly.")
+    if args.rop_fbx_sidewalks_path is None:
+        log.warning("WARNING: No sidewalks FBX output path specified. Output may not be saved correctly.")
+
+    # Print a nice header and summary of the arguments
+    log.info("\n" + "*" * 80)
+    log.info("🛣️  STARTING HOUDINI SIDEWALKS & ROADS GENERATION")
+    log.info("*" * 80)
+
+    # Print a summary of the arguments (as a single log record)
+    settings = [
+        f"Houdini File: {args.hip}",
+        f"TOPnet Path: {args.topnet}",
+        f"Input File: {args.file1_path if args.file1_path else 'Not specified'}",
+        f"Splines Base Path: {args.base_path if args.base_path else 'Not specified'}",
+        f"Output Road FBX: {args.rop_fbx_road_path if args.rop_fbx_road_path else 'Not specified'}",
+        f"Output Sidewalks FBX: {args.rop_fbx_sidewalks_path if args.rop_fbx_sidewalks_path else 'Not specified'}",
+        f"Iteration Number: {args.iteration_number if args.iteration_number is not None else 'Not specified'}"
+    ]
+    if args.max_inflight is not None:
+        settings.append(f"Max In-Flight Work Items: {args.max_inflight}")
+    settings.append(f"Wait Mode: {args.wait_mode}")
+    if args.max_wait_time is not None:
+        settings.append(f"Max Wait Time: {args.max_wait_time}s")
+    if args.iterations:
+        settings.append(f"Iterations: {', '.join(str(iteration) for iteration in iterations)}")
+    settings.append(f"Switch Bool: {args.switch_bool}")
+    log.info("\nRunning with the following settings:\n" + "\n".join(f"  • {setting}" for setting in settings) + "\n")
+
+    # Load the Houdini file
+    load_hip_file(args.hip)
+
+    # Now let's configure all the nodes with our parameters
+    # These settings are shared by every iteration, so they're only applied once
+    # (in manual update mode, so dependent SOPs don't cook after every single set)
+    with deferred_updates():
+        apply_params(args)
+
+    # Now let's find the TOPnet we're going to cook
+    topnet_node, output_node = find_topnet(args.topnet, args.debug)
+
+    # Bound the number of work items cooking at the same time (if requested)
+    limit_scheduler_slots(topnet_node, args.max_inflight)
+
+    # Resolve the nodes and parameters every iteration touches, once for the whole session
+    refs = resolve_scene_refs(topnet_node, output_node)
+
+    # In server mode the iterations come from stdin instead of the command line
+    if args.server:
+        serve_iterations(args, refs)
+        log.info("\n📡 Server stopped")
+        return
+
+    # Cook each iteration against the already loaded .hip file
+    # Only the iteration number, the FBX output paths and an {iteration} input file change between iterations
+    for index, iteration_number in enumerate(iterations):
+        if len(iterations) > 1:
+            log.info("\n" + "=" * 80)
+            log.info(f"🔁 Iteration {iteration_number} ({index + 1}/{len(iterations)})")
+            log.info("=" * 80)
+        cook_iteration(args, refs, iteration_number)
+
+    log.info("\n🎉 Script completed successfully")
+    log.info("Sidewalks & Roads export has been generated and exported to FBX files.")
+    log.info("The next step is to import these FBX files into Unreal Engine.")
+    log.info("" + "-"*80)
+
+
+# ======================================================================
+# Main Execution
+# ======================================================================
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    # Log through a single batched stdout handler
+    # Debug records (e.g. parameters that were left unchanged) are only formatted with --debug
+    configure_logging(logging.DEBUG if args.debug else logging.INFO)
+
+    # Check if the hip file exists before importing hou
+    # Initializing the Houdini module takes seconds, so a bad path should fail before that
+    if not os.path.isfile(args.hip):
+        log.error(f"❌ ERROR: Houdini file not found at: {args.hip}")
+        log.info("Please check the path and make sure the file exists.")
+        sys.exit(1)
+
+    # Make sure the output folders exist, so a bad path fails now instead of deep inside the cook
+    ensure_output_directories((args.rop_fbx_road_path, args.rop_fbx_sidewalks_path))
+
+    import hou
+
+    try:
+        main(args)
+    finally:
+        logging.shutdown()
+
+    # Exit with an explicit success code so callers can rely on it instead of scraping the log
+    sys.exit(0)
@@ -33,15 +33,23 @@ Usage:
 
 import unreal
 import os
+from collections import namedtuple
 
 # Define the workspace root relative to this script
 WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 
+# Where the Houdini sidewalks & roads step writes its FBX files, used when no fbx_dir is passed in
+DEFAULT_FBX_DIR = os.path.join(WORKSPACE_ROOT, "03_GenDatas", "Dependancies", "SW_Roads", "Out", "Mod")
+
+# Set to True to log every single mesh; otherwise each config only gets a one-line summary
+# (every unreal.log call flushes to the output log, which adds up over thousands of meshes)
+VERBOSE = False
+
 # FBX import settings that work well with Unreal Engine 5.3.2
 FBX_IMPORT_SETTINGS = {
     # General import task settings
     "automated": True,
-    "save": True,
+    "save": False,                        # Saved once per folder after the import instead of per package
     "replace_existing": True,
     
     # Basic factory options that are known to work in UE 5.3.2
@@ -52,6 +60,233 @@ FBX_IMPORT_SETTINGS = {
     }
 }
 
+# One FBX file to import, with every path and name derived from it worked out up front
+# (name_filter_lower is the lowercase filter, or None to match every mesh in the folder)
+ImportConfig = namedtuple("ImportConfig", "source_file folder_path asset_name name_filter name_filter_lower")
+
+# Helper function to make sure a content folder exists
+def ensure_content_folder(editor_lib, folder_path):
+    """Create folder_path in the content browser if it doesn't exist yet"""
+    if not editor_lib.does_directory_exist(folder_path):
+        unreal.log(f"📂 Creating folder: {folder_path}")
+        if not editor_lib.make_directory(folder_path):
+            unreal.log_warning(f"⚠️ Couldn't create folder: {folder_path}")
+            return
+        unreal.log(f"✅ Folder created successfully")
+
+# Helper function to list a folder's static meshes through the asset registry
+# The registry filters by class from its cached metadata, so nothing has to be loaded to check it
+def list_folder_meshes(asset_registry, folder_path, folder_asset_cache):
+    """Return the AssetData for every static mesh under folder_path, querying the registry once per folder"""
+    if folder_path not in folder_asset_cache:
+        prefetch_folder_meshes(asset_registry, [folder_path], folder_asset_cache)
+    return folder_asset_cache[folder_path]
+
+# Helper function to list the static meshes of several folders at once
+def prefetch_folder_meshes(asset_registry, folder_paths, folder_asset_cache):
+    """Fill folder_asset_cache for every folder in folder_paths with a single registry query"""
+    folder_paths = [folder_path for folder_path in dict.fromkeys(folder_paths) if folder_path not in folder_asset_cache]
+    if not folder_paths:
+        return
+    
+    ar_filter = unreal.ARFilter(
+        package_paths=folder_paths,
+        class_names=["StaticMesh"],
+        recursive_paths=True
+    )
+    for folder_path in folder_paths:
+        folder_asset_cache[folder_path] = []
+    
+    # Hand each mesh to the folder(s) it lives under (the query is recursive)
+    for asset_data in asset_registry.get_assets(ar_filter):
+        package_path = str(asset_data.package_path)
+        for folder_path in folder_paths:
+            if package_path == folder_path or package_path.startswith(folder_path + "/"):
+                folder_asset_cache[folder_path].append(asset_data)
+
+# Helper function to find the static meshes in a folder
+def find_static_meshes(asset_registry, folder_path, name_filter_lower, folder_asset_cache):
+    """
+    Return the static meshes in folder_path whose lowercased object path contains name_filter_lower.
+    
+    Each mesh is an (object path, package path, asset name) tuple read straight from its AssetData,
+    so callers never have to split the path strings apart again.
+    """
+    # Build each (object path, package path, asset name) and drop the ones the filter rejects
+    # (everything comes from registry metadata, so there's nothing here that needs a try/except)
+    # (asset names are converted to strings once up front, since each one is used twice)
+    folder_meshes = list_folder_meshes(asset_registry, folder_path, folder_asset_cache)
+    asset_names = [str(asset_data.asset_name) for asset_data in folder_meshes]
+    candidates = [
+        (f"{asset_data.package_name}.{asset_name}", str(asset_data.package_path), asset_name)
+        for asset_data, asset_name in zip(folder_meshes, asset_names)
+    ]
+    return [mesh for mesh in candidates if not name_filter_lower or name_filter_lower in mesh[0].lower()]
+
+# Helper function to read back what an import task created
+def imported_mesh_paths(asset_registry, task):
+    """Return the object paths of the static meshes the task imported (skipping materials and textures)"""
+    try:
+        imported_paths = [str(path) for path in task.get_editor_property("imported_object_paths")]
+    except Exception as e:
+        unreal.log_warning(f"⚠️ Couldn't read the imported objects: {str(e)}")
+        return []
+    # Check the class in the registry rather than the name, since materials are named after the FBX too
+    mesh_paths = []
+    for path in imported_paths:
+        asset_data = asset_registry.get_asset_by_object_path(path)
+        if asset_data.is_valid() and str(asset_data.asset_class_path.asset_name) == "StaticMesh":
+            mesh_paths.append(path)
+    return mesh_paths
+
+# Helper function to create an import task with our standard settings
+def create_import_task(source_file, destination_path, destination_name):
+    """Create an automated AssetImportTask that replaces existing assets (saving is left to save_imported_folders)"""
+    task = unreal.AssetImportTask()
+    task.filename = source_file
+    task.destination_path = destination_path
+    task.destination_name = destination_name
+    task.replace_existing = FBX_IMPORT_SETTINGS["replace_existing"]
+    task.automated = FBX_IMPORT_SETTINGS["automated"]
+    task.save = FBX_IMPORT_SETTINGS["save"]
+    
+    # Give every task the shared factory, otherwise AssetTools builds a new one for each file in the batch
+    task.factory = get_fbx_factory()
+    return task
+
+# The configured FBX factory, built on first use and shared by every import task
+# (999_UE_manager.py reloads this module for each run, so a run never picks up a stale factory)
+_fbx_factory = None
+
+# Helper function to get the FBX factory that imports materials and textures
+# Each property set is a reflected call into the engine, so the factory is only configured once
+def get_fbx_factory():
+    """Return the shared FbxFactory, creating it with the property style used by this UE version"""
+    global _fbx_factory
+    if _fbx_factory is not None:
+        return _fbx_factory
+    
+    factory = unreal.FbxFactory()
+    
+    # Try different approaches to set the properties based on UE version
+    unreal.log("  Configuring FBX import settings...")
+    try:
+        # Try using set_editor_property (newer UE versions)
+        factory.set_editor_property('ImportMaterials', True)
+        factory.set_editor_property('ImportTextures', True)
+        unreal.log("  ✅ Using set_editor_property for factory configuration")
+    except Exception as prop_e:
+        unreal.log_warning(f"  ⚠️ Could not set properties using set_editor_property: {str(prop_e)}")
+        
+        # Try direct property access as a fallback (older UE versions)
+        try:
+            # Different UE versions might use different property names
+            if hasattr(factory, 'ImportMaterials'):
+                factory.ImportMaterials = True
+                factory.ImportTextures = True
+                unreal.log("  ✅ Using ImportMaterials property (capital letters)")
+            elif hasattr(factory, 'import_materials'):
+                factory.import_materials = True
+                factory.import_textures = True
+                unreal.log("  ✅ Using import_materials property (lowercase)")
+        except Exception as attr_e:
+            unreal.log_warning(f"  ⚠️ Could not set properties directly: {str(attr_e)}")
+            unreal.log_warning("  ⚠️ Will proceed with default factory settings")
+    _fbx_factory = factory
+    return factory
+
+# Helper function to save everything an import touched
+def save_imported_folders(editor_asset_subsystem, folder_paths):
+    """Save the dirty packages under each folder with one save_directory call per folder"""
+    for folder_path in dict.fromkeys(folder_paths):
+        try:
+            if not editor_asset_subsystem.save_directory(folder_path, only_if_is_dirty=True, recursive=True):
+                unreal.log_warning(f"⚠️ Some assets in {folder_path} couldn't be saved")
+        except Exception as e:
+            unreal.log_warning(f"⚠️ Problem saving {folder_path}: {str(e)}")
+
+# Which fallback import methods this UE version has, probed once on the classes at load time
+# rather than on every subsystem instance each time a fallback runs
+HAS_SUBSYSTEM_IMPORT = hasattr(unreal.EditorAssetSubsystem, 'import_asset')
+CONTENT_BROWSER_IMPORT_METHOD = next(
+    (method_name for method_name in ('import_assets_autosave', 'import_asset_from_path')
+     if hasattr(getattr(unreal, 'ContentBrowserSubsystem', None), method_name)),
+    None
+)
+
+# Helper function for import method 2: the EditorAssetSubsystem
+def import_with_editor_subsystem(config, editor_asset_subsystem):
+    """Import the config's FBX file with EditorAssetSubsystem.import_asset, returning True if it worked"""
+    source_file = config.source_file
+    asset_name = config.asset_name
+    
+    unreal.log("\n🛠 Method 2: Using EditorAssetSubsystem...")
+    try:
+        full_path = f"{config.folder_path}/{asset_name}"
+        unreal.log(f"  Trying to import to: {full_path}")
+        
+        # Import using the editor subsystem if available
+        if HAS_SUBSYSTEM_IMPORT:
+            unreal.log("  Found import_asset method, attempting import...")
+            result = editor_asset_subsystem.import_asset(source_file, full_path)
+            
+            if result:
+                unreal.log("  ✅ Successfully imported using editor subsystem!")
+                return True
+            unreal.log_warning(f"  ⚠️ Editor subsystem import failed for {asset_name}")
+        else:
+            unreal.log_warning("  ⚠️ Editor subsystem doesn't have import_asset method - your UE version might be older")
+    except Exception as subsys_e:
+        unreal.log_warning(f"  ⚠️ Editor subsystem import error: {str(subsys_e)}")
+    return False
+
+# Helper function for import method 3: the ContentBrowserSubsystem
+def import_with_content_browser(config, editor_asset_subsystem):
+    """Import the config's FBX file through the ContentBrowserSubsystem, returning True if it worked"""
+    source_file = config.source_file
+    folder_path = config.folder_path
+    
+    unreal.log("\n🛠 Method 3: Using ContentBrowserSubsystem...")
+    try:
+        # Get the content browser module
+        content_browser = unreal.get_editor_subsystem(unreal.ContentBrowserSubsystem)
+        if not content_browser:
+            unreal.log_warning("  ⚠️ Could not get content browser subsystem")
+            return False
+        
+        unreal.log(f"  Attempting to import to: {folder_path}/{config.asset_name}")
+        
+        # Different UE versions have different methods
+        imported = False
+        if CONTENT_BROWSER_IMPORT_METHOD == 'import_assets_autosave':
+            unreal.log("  Found import_assets_autosave method, attempting import...")
+            imported = content_browser.import_assets_autosave([source_file], folder_path)
+        elif CONTENT_BROWSER_IMPORT_METHOD == 'import_asset_from_path':
+            unreal.log("  Found import_asset_from_path method, attempting import...")
+            imported = content_browser.import_asset_from_path(source_file, folder_path)
+        else:
+            unreal.log_warning("  ⚠️ No suitable import method found in ContentBrowserSubsystem")
+        
+        if imported:
+            unreal.log("  ✅ Successfully imported using content browser!")
+            return True
+        unreal.log_warning("  ⚠️ Content browser import returned False")
+    except Exception as cb_e:
+        unreal.log_warning(f"  ⚠️ Content browser import error: {str(cb_e)}")
+    return False
+
+# Import methods to fall back on when the AssetTools batch import didn't create anything,
+# in the order they're tried (we stop at the first one that works)
+FALLBACK_IMPORT_METHODS = (import_with_editor_subsystem, import_with_content_browser)
+
+# Helper function to import a new FBX file when the AssetTools import didn't create anything
+def import_with_fallbacks(config, editor_asset_subsystem):
+    """Try each fallback import method in turn, returning True as soon as one works"""
+    for import_method in FALLBACK_IMPORT_METHODS:
+        if import_method(config, editor_asset_subsystem):
+            return True
+    return False
+
 def reimport_folder_static_meshes(iteration_number=None, fbx_dir=None):
     """
     Imports or reimports static meshes from FBX files into Unreal Engine.
@@ -83,30 +318,32 @@ def reimport_folder_static_meshes(iteration_number=None, fbx_dir=None):
     
     # Determine the FBX directory
     if fbx_dir is None:
-        fbx_dir = os.path.join(WORKSPACE_ROOT, "03_GenDatas", "Dependancies", "SW_Roads", "Out", "Mod")
+        fbx_dir = DEFAULT_FBX_DIR
         unreal.log(f"ℹ️ No FBX directory provided, using default: {fbx_dir}")
     else:
         unreal.log(f"ℹ️ Using custom FBX directory: {fbx_dir}")
     
-    # Check if the directory exists
-    if not os.path.exists(fbx_dir):
-        unreal.log_error(f"❌ FBX directory not found: {fbx_dir}")
-        unreal.log_warning("⚠️ Please make sure the Houdini sidewalks & roads generation script has been run first.")
-        return 0
-    
     # Define what we're importing - sidewalks and roads meshes for this iteration
     import_configs = []
     
     # Look for FBX files that match the iteration number
     unreal.log(f"\n📂 Scanning directory for FBX files matching iteration {iteration_number}: {fbx_dir}")
     try:
-        # Get all FBX files in the directory
-        all_fbx_files = [f for f in os.listdir(fbx_dir) if f.endswith('.fbx')]
+        # Get all FBX files in the directory (name -> full path)
+        # scandir reads the file types along with the names, so this needs no extra stat calls
+        # (a missing directory shows up here, so it isn't checked separately first)
+        try:
+            with os.scandir(fbx_dir) as entries:
+                all_fbx_files = {entry.name: entry.path for entry in entries if entry.name.endswith('.fbx') and entry.is_file()}
+        except (FileNotFoundError, NotADirectoryError):
+            unreal.log_error(f"❌ FBX directory not found: {fbx_dir}")
+            unreal.log_warning("⚠️ Please make sure the Houdini sidewalks & roads generation script has been run first.")
+            return 0
         
         # Filter for files that match the expected naming patterns for this iteration
         # The Houdini script generates files named road_{iteration_number}.fbx and sidewalks_{iteration_number}.fbx
         expected_patterns = [f"road_{iteration_number}.fbx", f"sidewalks_{iteration_number}.fbx"]
-        fbx_files = [f for f in all_fbx_files if f in expected_patterns]
+        fbx_files = [f for f in expected_patterns if f in all_fbx_files]
         
         if fbx_files:
             unreal.log(f"✅ Found {len(fbx_files)} FBX files matching iteration {iteration_number}!")
@@ -117,7 +354,7 @@ def reimport_folder_static_meshes(iteration_number=None, fbx_dir=None):
             unreal.log_warning(f"⚠️ No FBX files matching iteration {iteration_number} found in directory: {fbx_dir}")
             if all_fbx_files:
                 unreal.log_warning(f"ℹ️ Found {len(all_fbx_files)} FBX files with other iteration numbers:")
-                for fbx_file in all_fbx_files[:5]:  # Show up to 5 examples
+                for fbx_file in list(all_fbx_files)[:5]:  # Show up to 5 examples
                     unreal.log_warning(f"  • {fbx_file}")
                 if len(all_fbx_files) > 5:
                     unreal.log_warning(f"  ... and {len(all_fbx_files) - 5} more")
@@ -135,16 +372,17 @@ def reimport_folder_static_meshes(iteration_number=None, fbx_dir=None):
         # Extract the base name without extension
         base_name = os.path.splitext(fbx_file)[0]
         
-        # Create a config for each FBX file
-        source_file = os.path.join(fbx_dir, fbx_file)
+        # Create a config for each FBX file (using the path scandir already built)
+        source_file = all_fbx_files[fbx_file]
         folder_path = f"/Game/luk4m4_Undini/Assets/{base_name}"
         
-        import_configs.append({
-            "source_file": source_file,
-            "folder_path": folder_path,
-            "asset_name": base_name,
-            "name_filter": base_name
-        })
+        import_configs.append(ImportConfig(
+            source_file=source_file,
+            folder_path=folder_path,
+            asset_name=base_name,
+            name_filter=base_name,
+            name_filter_lower=base_name.lower()
+        ))
         unreal.log(f"  • Will import: {fbx_file} to {folder_path}")
         
     if not import_configs:
@@ -160,238 +398,120 @@ def reimport_folder_static_meshes(iteration_number=None, fbx_dir=None):
     editor_lib = unreal.EditorAssetLibrary
     asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
     editor_asset_subsystem = unreal.get_editor_subsystem(unreal.EditorAssetSubsystem)
+    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    
+    # Static meshes per folder from the asset registry, so each folder is only queried once
+    folder_asset_cache = {}
+    
+    # Look up the existing meshes of every destination folder in one registry query
+    prefetch_folder_meshes(asset_registry, [config.folder_path for config in import_configs], folder_asset_cache)
     
     # Keep track of what we've processed
     total_processed = 0
     total_success = 0
     
-    # Process each import configuration
-    unreal.log("\n📊 Starting import/update process...")
+    # Build the import tasks for every configuration first, so they can all go through a
+    # single import call (each import_asset_tasks call pays its own factory setup and saves)
+    unreal.log("\n📊 Preparing import/update tasks...")
+    update_tasks = []  # (config asset name, task, mesh name) for meshes that already exist
+    new_imports = []   # (config, task) for FBX files that haven't been imported yet
     for config in import_configs:
-        source_file = config["source_file"]
-        folder_path = config["folder_path"]
-        asset_name = config["asset_name"]
-        name_filter = config.get("name_filter", "")
-        
-        # Make sure the source file exists
-        if not os.path.exists(source_file):
-            unreal.log_warning(f"⚠️ Hmm, can't find the source file: {source_file}")
-            unreal.log_warning(f"  Did you generate it first? Skipping this file.")
-            continue
+        source_file, folder_path, asset_name = config.source_file, config.folder_path, config.asset_name
         
         unreal.log(f"\n🎟 Processing: {asset_name}")
         unreal.log(f"  Source: {source_file}")
         unreal.log(f"  Destination: {folder_path}")
         
         # Create the destination folder if needed
-        if not editor_lib.does_directory_exist(folder_path):
-            unreal.log(f"📂 Creating folder: {folder_path}")
-            editor_lib.make_directory(folder_path)
-            unreal.log(f"✅ Folder created successfully")
+        ensure_content_folder(editor_lib, folder_path)
         
         # Look for existing static meshes that match our filter
         unreal.log(f"🔍 Checking for existing meshes in {folder_path}...")
-        assets = editor_lib.list_assets(folder_path, recursive=True, include_folder=False)
-        existing_meshes = []
-        
-        # Find static meshes that match our filter
-        for asset_path in assets:
-            try:
-                if name_filter and name_filter.lower() not in asset_path.lower():
-                    continue
-                    
-                asset = editor_lib.load_asset(asset_path)
-                if asset and isinstance(asset, unreal.StaticMesh):
-                    existing_meshes.append(asset_path)
-            except Exception as e:
-                unreal.log_warning(f"⚠️ Trouble checking asset {asset_path}: {str(e)}")
+        existing_meshes = find_static_meshes(asset_registry, folder_path, config.name_filter_lower, folder_asset_cache)
         
         if existing_meshes:
             unreal.log(f"✅ Found {len(existing_meshes)} existing meshes to update")
             
-            # Update existing meshes
-            for asset_path in existing_meshes:
-                try:
-                    mesh_name = os.path.basename(asset_path)
-                    unreal.log(f"🔄 Updating: {mesh_name}")
-                    
-                    # Try to reimport using the asset registry
-                    asset = editor_lib.load_asset(asset_path)
-                    if asset:
-                        # Create a reimport task
-                        task = unreal.AssetImportTask()
-                        task.filename = source_file
-                        task.destination_path = os.path.dirname(asset_path)
-                        task.destination_name = os.path.basename(asset_path).split(".")[0]
-                        task.replace_existing = True
-                        task.automated = True
-                        task.save = True
-                        
-                        # Do the reimport
-                        unreal.log("  Reimporting using AssetTools...")
-                        result = asset_tools.import_asset_tasks([task])
-                        
-                        if result and len(result) > 0:
-                            unreal.log(f"✅ Successfully updated: {mesh_name}")
-                            total_success += 1
-                        else:
-                            unreal.log(f"ℹ️ Update process completed - check Content Browser")
-                            total_success += 1
-                    
-                    total_processed += 1
-                except Exception as e:
-                    unreal.log_error(f"❌ Couldn't update {mesh_name}: {str(e)}")
-                    total_processed += 1
+            # Queue a reimport task for every existing mesh
+            for asset_path, package_path, mesh_name in existing_meshes:
+                if VERBOSE:
+                    unreal.log(f"🔄 Will update: {mesh_name}")
+                task = create_import_task(source_file, package_path, mesh_name)
+                update_tasks.append((asset_name, task, mesh_name))
         else:
             unreal.log(f"ℹ️ No existing meshes found in {folder_path}")
             unreal.log(f"  Will create new meshes instead")
-
             unreal.log(f"🌟 Creating new meshes from: {source_file}")
             
-            # Try to import new meshes - we'll try multiple methods if necessary
-            try:
-                unreal.log("\n🛠 Method 1: Using AssetImportTask with FbxFactory...")
-                # Create an import task
-                task = unreal.AssetImportTask()
-                task.filename = source_file
-                task.destination_path = folder_path
-                task.destination_name = asset_name
-                task.replace_existing = True
-                task.automated = True
-                task.save = True
-                
-                # Create a factory with the right settings
-                factory = unreal.FbxFactory()
-                
-                # Try different approaches to set the properties based on UE version
-                unreal.log("  Configuring FBX import settings...")
-                try:
-                    # Try using set_editor_property (newer UE versions)
-                    factory.set_editor_property('ImportMaterials', True)
-                    factory.set_editor_property('ImportTextures', True)
-                    unreal.log("  ✅ Using set_editor_property for factory configuration")
-                except Exception as prop_e:
-                    unreal.log_warning(f"  ⚠️ Could not set properties using set_editor_property: {str(prop_e)}")
-                    
-                    # Try direct property access as a fallback (older UE versions)
-                    try:
-                        # Different UE versions might use different property names
-                        if hasattr(factory, 'ImportMaterials'):
-                            factory.ImportMaterials = True
-                            factory.ImportTextures = True
-                            unreal.log("  ✅ Using ImportMaterials property (capital letters)")
-                        elif hasattr(factory, 'import_materials'):
-                            factory.import_materials = True
-                            factory.import_textures = True
-                            unreal.log("  ✅ Using import_materials property (lowercase)")
-                    except Exception as attr_e:
-                        unreal.log_warning(f"  ⚠️ Could not set properties directly: {str(attr_e)}")
-                        unreal.log_warning("  ⚠️ Will proceed with default factory settings")
-                
-                # Assign the factory to the task
-                task.factory = factory
-                
-                # Do the import
-                unreal.log("  Starting import with asset tools...")
-                result = asset_tools.import_asset_tasks([task])
-                
-                if result and len(result) > 0:
-                    unreal.log("  ✅ Successfully imported new meshes!")
-                    
-                    # Count how many new meshes we got
-                    unreal.log("  Counting newly created mesh assets...")
-                    new_assets = editor_lib.list_assets(folder_path, recursive=True, include_folder=False)
-                    new_meshes = []
-                    
-                    for asset_path in new_assets:
-                        try:
-                            if name_filter and name_filter.lower() not in asset_path.lower():
-                                continue
-                                
-                            asset = editor_lib.load_asset(asset_path)
-                            if asset and isinstance(asset, unreal.StaticMesh):
-                                new_meshes.append(asset_path)
-                        except Exception:
-                            pass
-                    
-                    new_count = len(new_meshes)
-                    unreal.log(f"  📊 Found {new_count} new mesh assets")
-                    for mesh_path in new_meshes:
-                        unreal.log(f"    • {os.path.basename(mesh_path)}")
-                    total_success += new_count
-                    total_processed += new_count
-                else:
-                    # Primary method didn't work, we'll try alternatives
-                    unreal.log("  ⚠️ First method didn't succeed, trying alternatives...")
-
-                    # Method 2: Try using the editor subsystem
-                    unreal.log("\n🛠 Method 2: Using EditorAssetSubsystem...")
-                    try:
-                        full_path = f"{folder_path}/{asset_name}"
-                        unreal.log(f"  Trying to import to: {full_path}")
-                        
-                        # Import using the editor subsystem if available
-                        if hasattr(editor_asset_subsystem, 'import_asset'):
-                            unreal.log("  Found import_asset method, attempting import...")
-                            result = editor_asset_subsystem.import_asset(source_file, full_path)
-                            
-                            if result:
-                                unreal.log("  ✅ Successfully imported using editor subsystem!")
-                                total_success += 1
-                                continue
-                            else:
-                                unreal.log_warning(f"  ⚠️ Editor subsystem import failed for {asset_name}")
-                        else:
-                            unreal.log_warning("  ⚠️ Editor subsystem doesn't have import_asset method - your UE version might be older")
-                    except Exception as subsys_e:
-                        unreal.log_warning(f"  ⚠️ Editor subsystem import error: {str(subsys_e)}")
-                    
-                    # Method 3: Try using the content browser directly
-                    unreal.log("\n🛠 Method 3: Using ContentBrowserSubsystem...")
-                    try:
-                        # Get the content browser module
-                        content_browser = unreal.get_editor_subsystem(unreal.ContentBrowserSubsystem)
-                        if content_browser:
-                            # Create the destination path
-                            destination_path = f"{folder_path}/{asset_name}"
-                            unreal.log(f"  Attempting to import to: {destination_path}")
-                            
-                            # Try to import using the content browser
-                            imported = False
-                            
-                            # Different UE versions have different methods
-                            if hasattr(content_browser, 'import_assets_autosave'):
-                                unreal.log("  Found import_assets_autosave method, attempting import...")
-                                imported = content_browser.import_assets_autosave([source_file], folder_path)
-                            elif hasattr(content_browser, 'import_asset_from_path'):
-                                unreal.log("  Found import_asset_from_path method, attempting import...")
-                                imported = content_browser.import_asset_from_path(source_file, folder_path)
-                            else:
-                                unreal.log_warning("  ⚠️ No suitable import method found in ContentBrowserSubsystem")
-                            
-                            if imported:
-                                unreal.log("  ✅ Successfully imported using content browser!")
-                                total_success += 1
-                                continue
-                            else:
-                                unreal.log_warning("  ⚠️ Content browser import returned False")
-                        else:
-                            unreal.log_warning("  ⚠️ Could not get content browser subsystem")
-                    except Exception as cb_e:
-                        unreal.log_warning(f"  ⚠️ Content browser import error: {str(cb_e)}")
-                        
-                    # If we get here, all methods failed
-                    unreal.log_error(f"\n❌ All import methods failed for {asset_name}")
-                    unreal.log_error(f"  This might be due to incompatibility with your UE version")
-                    unreal.log_error(f"  Consider importing the FBX files manually through the Unreal Editor")
-                    
-                    total_processed += 1
-            except Exception as e:
-                unreal.log_error(f"❌ Problem during import process: {str(e)}")
-                total_processed += 1
-    
-    # Show a summary of what we did
+            # Queue an import task for the new meshes
+            task = create_import_task(source_file, folder_path, asset_name)
+            new_imports.append((config, task))
+    
+    # Run every task in one go
+    # (import_assets_automated would also take many files, but only into a single destination_path,
+    # while our tasks go to separate road/sidewalks folders and back onto existing mesh names)
+    # Sidewalks and roads share this one call, which leaves the engine free to build their meshes
+    # side by side; a second editor process wouldn't help, as both would need the same project open
+    tasks = [task for _, task, _ in update_tasks] + [task for _, task in new_imports]
+    batch_failed = False
+    if tasks:
+        unreal.log(f"\n🛠 Importing {len(tasks)} tasks with AssetTools in a single batch...")
+        try:
+            asset_tools.import_asset_tasks(tasks)
+        except Exception as e:
+            unreal.log_error(f"❌ Problem during batch import: {str(e)}")
+            batch_failed = True
+    
+    # Per-config counters (asset name -> [succeeded, processed]) for the one-line summaries
+    config_counts = {config.asset_name: [0, 0] for config in import_configs}
+    
+    # Count the updated meshes, using what each task reports it imported
+    for asset_name, task, mesh_name in update_tasks:
+        config_counts[asset_name][1] += 1
+        if batch_failed or not imported_mesh_paths(asset_registry, task):
+            unreal.log_warning(f"⚠️ Couldn't update: {mesh_name}")
+        else:
+            if VERBOSE:
+                unreal.log(f"✅ Successfully updated: {mesh_name}")
+            config_counts[asset_name][0] += 1
+    
+    # Check what the new imports created, falling back to the other import methods if nothing was
+    for config, task in new_imports:
+        asset_name = config.asset_name
+        
+        # Count how many new meshes we got, straight from what the task reports it created
+        unreal.log(f"\n🔍 Counting newly created mesh assets for {asset_name}...")
+        new_meshes = [] if batch_failed else imported_mesh_paths(asset_registry, task)
+        if new_meshes:
+            unreal.log(f"  📊 Found {len(new_meshes)} new mesh assets")
+            if VERBOSE:
+                for mesh_path in new_meshes:
+                    unreal.log(f"    • {mesh_path}")
+            config_counts[asset_name][0] += len(new_meshes)
+            config_counts[asset_name][1] += len(new_meshes)
+            continue
+        
+        # The batch import didn't create anything for this file, try the alternatives
+        unreal.log("  ⚠️ Batch import didn't create any meshes, trying alternatives...")
+        config_counts[asset_name][1] += 1
+        if import_with_fallbacks(config, editor_asset_subsystem):
+            config_counts[asset_name][0] += 1
+        else:
+            # If we get here, all methods failed
+            unreal.log_error(f"\n❌ All import methods failed for {asset_name}")
+            unreal.log_error(f"  This might be due to incompatibility with your UE version")
+            unreal.log_error(f"  Consider importing the FBX files manually through the Unreal Editor")
+    
+    # Save the imported and updated meshes in one go per destination folder
+    unreal.log("\n💾 Saving imported meshes...")
+    save_imported_folders(editor_asset_subsystem, [config.folder_path for config in import_configs])
+    
+    # Show a summary of what we did, one line per config and then the totals
     unreal.log(f"\n📊 Import/Update Summary")
+    for asset_name, (succeeded, processed) in config_counts.items():
+        unreal.log(f"  • {asset_name}: {succeeded}/{processed} imported or updated")
+        total_success += succeeded
+        total_processed += processed
     unreal.log(f"  • Successfully processed: {total_success} of {total_processed} meshes")
     unreal.log(f"  • Success rate: {(total_success/max(1, total_processed))*100:.1f}%")
     
@@ -416,12 +536,8 @@ if __name__ == "__main__":
     unreal.log("This is the seventh step in the Undini procedural generation pipeline.")
     unreal.log("It imports the sidewalks and roads FBX files generated by the Houdini script.")
     
-    # You can modify these parameters for testing
-    iteration_number = 0  # Change this as needed
-    fbx_dir = None  # Use default directory
-    
-    # Call the main function
-    result = reimport_folder_static_meshes(iteration_number=iteration_number, fbx_dir=fbx_dir)
+    # Call the main function (change these arguments for testing; fbx_dir=None uses DEFAULT_FBX_DIR)
+    result = reimport_folder_static_meshes(iteration_number=0, fbx_dir=None)
     
     # Report the results
     if result > 0:
@@ -30,6 +30,62 @@ Usage:
 
 import unreal
 import os
+from collections import defaultdict
+
+# Content folder that 210_reimport_SM.py imports each FBX file into (as <ASSETS_ROOT>/<fbx name>)
+ASSETS_ROOT = "/Game/luk4m4_Undini/Assets"
+
+# Marker between the mesh base name and the piece number, e.g. road_5_piece_12
+PIECE_MARKER = "_piece_"
+
+
+# Simple debug log function with emoji indicators for better readability
+def debug_log(msg, level="info"):
+    """Log a message with appropriate level and emoji indicator"""
+    if level == "info":
+        unreal.log(f"ℹ️ {msg}")
+    elif level == "success":
+        unreal.log(f"✅ {msg}")
+    elif level == "warning":
+        unreal.log_warning(f"⚠️ {msg}")
+    elif level == "error":
+        unreal.log_error(f"❌ {msg}")
+    else:
+        unreal.log(f"🔍 {msg}")  # Debug level
+
+
+# Helper function to get the project's static meshes grouped by piece prefix
+def get_static_mesh_buckets(asset_registry, iteration_number):
+    """
+    Return a dict mapping each '<name>_piece_' prefix to (AssetData, asset name) pairs for its pieces.
+    
+    Only the iteration's road and sidewalks folders are queried. The results are grouped in a
+    single pass, so each prefix lookup afterwards is a plain dict access.
+    """
+    # Scope the query to this iteration's folders instead of every static mesh in the project
+    # (one filtered query covers both folders and the class check, where get_assets_by_path would
+    # need a call per folder and a class check in Python afterwards)
+    ar_filter = unreal.ARFilter(
+        package_paths=[f"{ASSETS_ROOT}/sidewalks_{iteration_number}", f"{ASSETS_ROOT}/road_{iteration_number}"],
+        class_names=["StaticMesh"],
+        recursive_classes=True,
+        recursive_paths=True
+    )
+    
+    # Get the static mesh assets in those folders
+    debug_log(f"Querying asset registry for static meshes in iteration {iteration_number}'s folders...", "debug")
+    asset_data_list = asset_registry.get_assets(ar_filter)
+    debug_log(f"Found {len(asset_data_list)} static meshes in those folders", "debug")
+    
+    # Group the pieces by everything up to and including the piece marker
+    # (each name is converted to a string once here and kept alongside its AssetData for later)
+    buckets = defaultdict(list)
+    for asset_data in asset_data_list:
+        asset_name = str(asset_data.asset_name)
+        base_name, marker, _ = asset_name.partition(PIECE_MARKER)
+        if marker:
+            buckets[base_name + marker].append((asset_data, asset_name))
+    return buckets
 
 
 def add_SM_sidewalks_and_roads_to_level(iteration_number=1):
@@ -53,47 +109,25 @@ def add_SM_sidewalks_and_roads_to_level(iteration_number=1):
     # Define names and folders for organizing actors in the level
     sidewalk_folder = "Sidewalks"
     road_folder = "Roads"
-    
-    # Simple debug log function with emoji indicators for better readability
-    def debug_log(msg, level="info"):
-        """Log a message with appropriate level and emoji indicator"""
-        if level == "info":
-            unreal.log(f"ℹ️ {msg}")
-        elif level == "success":
-            unreal.log(f"✅ {msg}")
-        elif level == "warning":
-            unreal.log_warning(f"⚠️ {msg}")
-        elif level == "error":
-            unreal.log_error(f"❌ {msg}")
-        else:
-            unreal.log(f"🔍 {msg}")  # Debug level
 
     # Set up asset registry filter to find static meshes
     debug_log(f"Starting search for sidewalks and roads for iteration {iteration_number}", "info")
     
     try:
-        ar_filter = unreal.ARFilter(
-            class_names=["StaticMesh"],
-            recursive_classes=True,
-            recursive_paths=True
-        )
-        
-        # Get all static mesh assets
-        debug_log("Querying asset registry for all static meshes...", "debug")
-        asset_data_list = asset_registry.get_assets(ar_filter)
-        debug_log(f"Found {len(asset_data_list)} total static meshes in the project", "debug")
+        # Get all static mesh pieces, grouped by prefix
+        mesh_buckets = get_static_mesh_buckets(asset_registry, iteration_number)
         
         # Define prefixes for this iteration
-        sidewalk_prefix = f"sidewalks_{iteration_number}_piece_"
-        road_prefix = f"road_{iteration_number}_piece_"
+        sidewalk_prefix = f"sidewalks_{iteration_number}{PIECE_MARKER}"
+        road_prefix = f"road_{iteration_number}{PIECE_MARKER}"
         
         debug_log(f"Looking for assets with prefixes:", "debug")
         debug_log(f"  • Sidewalks: '{sidewalk_prefix}'", "debug")
         debug_log(f"  • Roads: '{road_prefix}'", "debug")
         
-        # Filter assets by name prefix
-        sidewalk_assets = [a for a in asset_data_list if str(a.asset_name).startswith(sidewalk_prefix)]
-        road_assets = [a for a in asset_data_list if str(a.asset_name).startswith(road_prefix)]
+        # Pick out the pieces for this iteration by name prefix
+        sidewalk_assets = mesh_buckets.get(sidewalk_prefix, [])
+        road_assets = mesh_buckets.get(road_prefix, [])
         
         # Log what we found with appropriate emoji indicators
         if sidewalk_assets:
@@ -110,12 +144,13 @@ def add_SM_sidewalks_and_roads_to_level(iteration_number=1):
         return False
 
     # Helper function to spawn an actor and put it in the right folder
-    def spawn_and_folder(asset_data, folder_name):
+    def spawn_and_folder(asset_data, asset_name, folder_name):
         """
         Spawn a static mesh actor in the level and organize it in a folder.
         
         Args:
             asset_data: The asset data object from the asset registry
+            asset_name: The asset's name, already converted to a string
             folder_name: The folder to place the actor in
             
         Returns:
@@ -123,12 +158,11 @@ def add_SM_sidewalks_and_roads_to_level(iteration_number=1):
         """
         # Get the asset path and load it
         asset_path = str(asset_data.package_name)
-        asset_name = str(asset_data.asset_name)
         debug_log(f"Loading asset: {asset_path}", "debug")
         
         try:
-            # Load the asset
-            asset = unreal.EditorAssetLibrary.load_asset(asset_path)
+            # Load the asset straight from its AssetData, so the path doesn't have to be resolved again
+            asset = asset_data.get_asset()
             
             # Check if the asset was loaded successfully
             if not asset:
@@ -154,7 +188,7 @@ def add_SM_sidewalks_and_roads_to_level(iteration_number=1):
                 
                 # Set the folder and name
                 actor.set_folder_path(folder_name)
-                actor.set_actor_label(asset_name, mark_dirty=True)
+                actor.set_actor_label(asset_name, mark_dirty=False)  # the spawn already dirtied the level
                 debug_log(f"Added '{asset_name}' to level in folder '{folder_name}'", "success")
                 return actor
             else:
@@ -179,25 +213,28 @@ def add_SM_sidewalks_and_roads_to_level(iteration_number=1):
     total_success = 0
     total_processed = 0
     
-    # Add all the sidewalk pieces to the level
-    if sidewalk_assets:
-        debug_log(f"\n🛠 Adding {len(sidewalk_assets)} sidewalk pieces to the level...", "info")
-        for i, asset_data in enumerate(sidewalk_assets):
-            debug_log(f"Processing sidewalk piece {i+1}/{len(sidewalk_assets)}: {asset_data.asset_name}", "debug")
-            actor = spawn_and_folder(asset_data, sidewalk_folder)
-            total_processed += 1
-            if actor:
-                total_success += 1
-    
-    # Add all the road pieces to the level
-    if road_assets:
-        debug_log(f"\n🛠 Adding {len(road_assets)} road pieces to the level...", "info")
-        for i, asset_data in enumerate(road_assets):
-            debug_log(f"Processing road piece {i+1}/{len(road_assets)}: {asset_data.asset_name}", "debug")
-            actor = spawn_and_folder(asset_data, road_folder)
-            total_processed += 1
-            if actor:
-                total_success += 1
+    # Spawn every piece inside one editor transaction, so the whole placement is a single undo step
+    # instead of one per actor
+    with unreal.ScopedEditorTransaction(f"Add sidewalks and roads (iteration {iteration_number})"):
+        # Add all the sidewalk pieces to the level
+        if sidewalk_assets:
+            debug_log(f"\n🛠 Adding {len(sidewalk_assets)} sidewalk pieces to the level...", "info")
+            for i, (asset_data, asset_name) in enumerate(sidewalk_assets):
+                debug_log(f"Processing sidewalk piece {i+1}/{len(sidewalk_assets)}: {asset_name}", "debug")
+                actor = spawn_and_folder(asset_data, asset_name, sidewalk_folder)
+                total_processed += 1
+                if actor:
+                    total_success += 1
+        
+        # Add all the road pieces to the level
+        if road_assets:
+            debug_log(f"\n🛠 Adding {len(road_assets)} road pieces to the level...", "info")
+            for i, (asset_data, asset_name) in enumerate(road_assets):
+                debug_log(f"Processing road piece {i+1}/{len(road_assets)}: {asset_name}", "debug")
+                actor = spawn_and_folder(asset_data, asset_name, road_folder)
+                total_processed += 1
+                if actor:
+                    total_success += 1
 
     # Show a summary of what we did
     debug_log(f"\n📊 Summary", "info")
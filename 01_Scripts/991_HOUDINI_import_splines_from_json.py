@@ -44,17 +44,17 @@ if "component_name" not in geo.pointAttribs():
     geo.addAttrib(hou.attribType.Point, "component_name", "")
 
 try:
-    # Check if the JSON file exists
-    if not os.path.exists(json_file_path):
+    # Load the JSON file
+    # Opening it directly also tells us whether it exists, so there's no separate exists() check
+    print(f"📂 Loading spline data from: {json_file_path}")
+    try:
+        with open(json_file_path, 'r') as json_file:
+            splines_data = json.load(json_file)
+    except FileNotFoundError:
         print(f"❌ Oh no! I couldn't find the spline data file at: {json_file_path}")
         print(f"💡 Tip: Make sure you've exported splines from Unreal Engine first using the 000_export_splines_as_json.py script.")
         raise Exception(f"File not found: {json_file_path}")
     
-    # Load the JSON file
-    print(f"📂 Loading spline data from: {json_file_path}")
-    with open(json_file_path, 'r') as json_file:
-        splines_data = json.load(json_file)
-    
     # Process each spline
     print(f"🔄 Found {len(splines_data)} splines to import...")
     point_count = 0
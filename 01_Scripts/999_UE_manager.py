@@ -3,7 +3,6 @@ import os
 import sys
 import subprocess
 import json
-import time
 import importlib.util
 
 # ======================================================================
@@ -27,6 +26,9 @@ UE_SPLINE_BP_PATH = f"{UE_BASE_PATH}/BP/BP_CityKit_spline"
 UE_MESH_TEMPLATE_PATH = f"{UE_BASE_PATH}/CSV/mesh_template"
 UE_MAT_TEMPLATE_PATH = f"{UE_BASE_PATH}/CSV/mat_template"
 
+# How long to wait for a headless Houdini run before letting it continue in the background (seconds)
+HOUDINI_WAIT_TIMEOUT = 32
+
 # Houdini paths
 HOUDINI_INSTALL_PATH = r"C:/Program Files/Side Effects Software/Houdini 20.0.653"
 # HIP file for PCG generation
@@ -51,10 +53,47 @@ SWR_FBX_OUTPUT_DIR = os.path.join(WORKSPACE_ROOT, "03_GenDatas", "Dependancies",
 for directory in [SPLINES_OUTPUT_DIR, CSV_OUTPUT_DIR, SWR_FBX_OUTPUT_DIR]:
     os.makedirs(directory, exist_ok=True)
 
+# Helper function to normalize paths to use forward slashes (Houdini expects them)
+# The translation table is built once here instead of on every call
+_SLASH_TABLE = str.maketrans('\\', '/')
+
+def normalize_path(path):
+    """Convert Windows path to use forward slashes"""
+    return path.translate(_SLASH_TABLE)
+
+# Helper function to check an output file with a single stat call
+def get_file_size(path):
+    """Return the size of the file at path in bytes, or None if it doesn't exist"""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
 # ======================================================================
 # Script Runner Function
 # ======================================================================
 
+def load_script(script_name):
+    """
+    Load a script file as a module so its functions can be called directly
+    
+    Args:
+        script_name (str): Name of the script file (e.g., "120_create_pcg_graph.py")
+        
+    Returns:
+        module: The freshly loaded module
+    """
+    # Full path to the script
+    script_path = os.path.join(SCRIPTS_DIR, script_name)
+    
+    # Import the module dynamically
+    module_name = os.path.splitext(script_name)[0]
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
 def run_script(script_name, function_name, **kwargs):
     """
     Run a function from a script file with the given arguments
@@ -65,15 +104,7 @@ def run_script(script_name, function_name, **kwargs):
         **kwargs: Arguments to pass to the function
     """
     try:
-        # Full path to the script
-        script_path = os.path.join(SCRIPTS_DIR, script_name)
-        
-        # Import the module dynamically
-        module_name = os.path.splitext(script_name)[0]
-        spec = importlib.util.spec_from_file_location(module_name, script_path)
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[module_name] = module
-        spec.loader.exec_module(module)
+        module = load_script(script_name)
         
         # Get the function
         if hasattr(module, function_name):
@@ -141,11 +172,6 @@ def run_houdini_headless(iteration_number, houdini_install_path, hip_file_path,
         else:
             unreal.log(f"Headless script found at: {headless_script}")
             
-        # Helper function to normalize paths to use forward slashes
-        def normalize_path(path):
-            """Convert Windows path to use forward slashes"""
-            return path.replace('\\', '/')
-            
         # Define input/output paths with forward slashes for Houdini
         mesh_csv_path = normalize_path(os.path.join(CSV_OUTPUT_DIR, f"mesh_{iteration_number}.csv"))
         mat_csv_path = normalize_path(os.path.join(CSV_OUTPUT_DIR, f"mat_{iteration_number}.csv"))
@@ -153,10 +179,10 @@ def run_houdini_headless(iteration_number, houdini_install_path, hip_file_path,
         # Define the splines base path (without iteration number and file extension)
         splines_base_path = normalize_path(os.path.join(SPLINES_OUTPUT_DIR, "splines_export_from_UE_"))
         
-        # Ensure output directories exist
-        os.makedirs(os.path.dirname(mesh_csv_path), exist_ok=True)
-        os.makedirs(os.path.dirname(mat_csv_path), exist_ok=True)
-        os.makedirs(SPLINES_OUTPUT_DIR, exist_ok=True)
+        # Ensure output directories exist (makedirs with exist_ok already covers existing folders,
+        # and both CSVs share a folder, so each folder is only created once)
+        for directory in {os.path.dirname(mesh_csv_path), os.path.dirname(mat_csv_path), SPLINES_OUTPUT_DIR}:
+            os.makedirs(directory, exist_ok=True)
         
         # Log the normalized paths
         unreal.log(f"Normalized mesh CSV path: {mesh_csv_path}")
@@ -198,18 +224,14 @@ def run_houdini_headless(iteration_number, houdini_install_path, hip_file_path,
             unreal.log_error(f"Houdini .hip file not found at: {hip_file_path}")
             return None
             
-        # Check if the splines directory exists and has files
+        # Check for the specific spline file we're expecting
+        # (the splines directory was created above, so it can be listed without checking first)
         splines_dir = os.path.dirname(splines_base_path)
-        if not os.path.exists(splines_dir):
-            unreal.log_warning(f"Splines directory does not exist: {splines_dir}")
-            os.makedirs(splines_dir, exist_ok=True)
-        else:
-            # Check for the specific spline file we're expecting
-            expected_spline_file = f"splines_export_from_UE_{iteration_number}.json"
-            spline_files = [f for f in os.listdir(splines_dir) if f.endswith('.json')]
-            if expected_spline_file not in spline_files:
-                unreal.log_warning(f"Expected spline file not found: {expected_spline_file}")
-                unreal.log_warning(f"You may need to run the spline export script first")
+        expected_spline_file = f"splines_export_from_UE_{iteration_number}.json"
+        spline_files = [f for f in os.listdir(splines_dir) if f.endswith('.json')]
+        if expected_spline_file not in spline_files:
+            unreal.log_warning(f"Expected spline file not found: {expected_spline_file}")
+            unreal.log_warning(f"You may need to run the spline export script first")
         
         # Run the command without creating a new console, to capture output
         unreal.log("Running Houdini process and capturing output...")
@@ -220,22 +242,18 @@ def run_houdini_headless(iteration_number, houdini_install_path, hip_file_path,
             universal_newlines=True
         )
         
-        # Wait a short time and check if process is still running
-        time.sleep(2)
-        if process.poll() is not None:
-            # Process has already terminated
-            stdout, stderr = process.communicate()
-            unreal.log_error(f"Houdini process terminated immediately with exit code: {process.returncode}")
-            unreal.log(f"STDOUT: {stdout}")
-            unreal.log_error(f"STDERR: {stderr}")
-            return None
-        
         unreal.log(f"Houdini process started with PID: {process.pid}")
-        unreal.log(f"Process is running. Waiting for completion...")
+        unreal.log(f"Waiting for completion (up to {HOUDINI_WAIT_TIMEOUT}s)...")
         
-        # Wait for process to complete with a timeout
+        # Wait for the process in a single call - this returns as soon as Houdini exits,
+        # so a quick failure is reported right away instead of after a fixed sleep
         try:
-            stdout, stderr = process.communicate(timeout=30)  # 30 second timeout
+            stdout, stderr = process.communicate(timeout=HOUDINI_WAIT_TIMEOUT)
+            if process.returncode != 0:
+                unreal.log_error(f"Houdini process failed with exit code: {process.returncode}")
+                unreal.log(f"STDOUT: {stdout}")
+                unreal.log_error(f"STDERR: {stderr}")
+                return None
             unreal.log(f"Houdini process completed with exit code: {process.returncode}")
             unreal.log(f"STDOUT: {stdout}")
             if stderr:
@@ -279,16 +297,24 @@ unreal.log(f"Houdini PCG generation result: {result}")
 #unreal.log(f"Create PCG graph result: {result}")
 
 # Run Houdini sidewalks & roads generation (uncomment to use)
-def run_houdini_sidewalks_roads(iteration_number, houdini_install_path, hip_file_path=None, file1_path=None, base_path=None, switch_bool=None):
+def run_houdini_sidewalks_roads(iteration_number, houdini_install_path, hip_file_path=None, file1_path=None, base_path=None, switch_bool=None, iterations=None):
     # Use global SWITCH_BOOL if switch_bool is not provided
     if switch_bool is None:
         switch_bool = SWITCH_BOOL
     # Use SWR_HIP_FILE_PATH if hip_file_path is not provided
     if hip_file_path is None:
         hip_file_path = SWR_HIP_FILE_PATH
-    """Run Houdini in headless mode to generate sidewalks and roads"""
+    """
+    Run Houdini in headless mode to generate sidewalks and roads.
+    
+    Pass a list of iteration numbers as iterations to cook them all in one hython process,
+    so the .hip file is only loaded once instead of once per iteration.
+    """
     try:
-        unreal.log(f"Starting Houdini sidewalks & roads generation with iteration number: {iteration_number}")
+        if iterations:
+            unreal.log(f"Starting Houdini sidewalks & roads generation for iterations: {iterations}")
+        else:
+            unreal.log(f"Starting Houdini sidewalks & roads generation with iteration number: {iteration_number}")
         unreal.log(f"Houdini install path: {houdini_install_path}")
         unreal.log(f"Hip file path: {hip_file_path}")
         
@@ -315,21 +341,18 @@ def run_houdini_sidewalks_roads(iteration_number, houdini_install_path, hip_file
         else:
             unreal.log(f"Headless script found at: {headless_script}")
             
-        # Helper function to normalize paths to use forward slashes
-        def normalize_path(path):
-            """Convert Windows path to use forward slashes"""
-            return path.replace('\\', '/')
-            
         # Define input/output paths with forward slashes for Houdini
-        road_fbx_path = normalize_path(os.path.join(SWR_FBX_OUTPUT_DIR, f"road_{iteration_number}.fbx"))
-        sidewalks_fbx_path = normalize_path(os.path.join(SWR_FBX_OUTPUT_DIR, f"sidewalks_{iteration_number}.fbx"))
+        # In batch mode the headless script fills in the {iteration} placeholder for each iteration
+        iteration_token = "{iteration}" if iterations else iteration_number
+        road_fbx_path = normalize_path(os.path.join(SWR_FBX_OUTPUT_DIR, f"road_{iteration_token}.fbx"))
+        sidewalks_fbx_path = normalize_path(os.path.join(SWR_FBX_OUTPUT_DIR, f"sidewalks_{iteration_token}.fbx"))
         
         # Define the splines base path (without iteration number and file extension)
         splines_base_path = normalize_path(os.path.join(SPLINES_OUTPUT_DIR, "splines_export_from_UE_"))
         
-        # Ensure output directories exist
-        os.makedirs(os.path.dirname(road_fbx_path), exist_ok=True)
-        os.makedirs(os.path.dirname(sidewalks_fbx_path), exist_ok=True)
+        # Ensure output directories exist (both FBX files share a folder, so it's only created once)
+        for directory in {os.path.dirname(road_fbx_path), os.path.dirname(sidewalks_fbx_path)}:
+            os.makedirs(directory, exist_ok=True)
         
         # Log the normalized paths
         unreal.log(f"Normalized road FBX path: {road_fbx_path}")
@@ -340,6 +363,11 @@ def run_houdini_sidewalks_roads(iteration_number, houdini_install_path, hip_file
         # Important: Use a string with proper quoting instead of a list to avoid issues with script path parsing
         cmd_str = f'"{hython_path}" "{headless_script}" --hip "{hip_file_path}" --topnet "/obj/geo1/topnet" --rop_fbx_road_path "{road_fbx_path}" --rop_fbx_sidewalks_path "{sidewalks_fbx_path}" --iteration_number {iteration_number} --switch_bool {switch_bool}'
         
+        # Cook every requested iteration in this one process
+        if iterations:
+            iterations_arg = ",".join(str(iteration) for iteration in iterations)
+            cmd_str += f' --iterations {iterations_arg}'
+        
         # Add base_path parameter if provided
         if base_path is not None:
             base_path = normalize_path(base_path)
@@ -347,16 +375,18 @@ def run_houdini_sidewalks_roads(iteration_number, houdini_install_path, hip_file
             unreal.log(f"Adding base_path: {base_path}")
         
         # Check if we need to add a file1_path parameter for input geometry
+        # file1_path always ends up bound to the path we pass, so later code can use it directly
         if file1_path is not None:
             # Use the provided file1_path
             file1_path = normalize_path(file1_path)
-            cmd_str += f' --file1_path "{file1_path}"'
             unreal.log(f"Adding custom file1_path: {file1_path}")
         else:
-            # Default
-            file_1_path = FILE1_PATH
-            cmd_str += f' --file1_path "{file_1_path}"'
-            unreal.log(f"Adding default file1_path: {file_1_path}")
+            # Default (in batch mode each iteration reads its own GenZone file)
+            file1_path = get_file1_path(iteration_token)
+            unreal.log(f"Adding default file1_path: {file1_path}")
+        if iterations and "{iteration}" not in file1_path:
+            unreal.log_warning(f"file1_path has no {{iteration}} placeholder, every iteration will read {file1_path}")
+        cmd_str += f' --file1_path "{file1_path}"'
         
         # For logging purposes, also create the command as a list
         cmd_list = [
@@ -370,12 +400,13 @@ def run_houdini_sidewalks_roads(iteration_number, houdini_install_path, hip_file
             "--switch_bool", str(switch_bool)
         ]
         
-        # Add file1_path to cmd_list
-        if file1_path is not None:
-            cmd_list.extend(["--file1_path", file1_path])
-        elif os.path.exists(splines_json_path):
-            cmd_list.extend(["--file1_path", splines_json_path])
+        # Add file1_path to cmd_list (the same path that was added to cmd_str)
+        cmd_list.extend(["--file1_path", file1_path])
             
+        # Add iterations to cmd_list in batch mode
+        if iterations:
+            cmd_list.extend(["--iterations", iterations_arg])
+        
         # Add base_path to cmd_list if provided
         if base_path is not None:
             cmd_list.extend(["--base_path", base_path])
@@ -384,18 +415,21 @@ def run_houdini_sidewalks_roads(iteration_number, houdini_install_path, hip_file
         unreal.log(f"Command: {' '.join(cmd_list)}")
         
         # Check if the splines directory exists and has files
+        # Listing it directly tells us both, so there's no separate exists() check
         splines_dir = os.path.dirname(splines_base_path)
-        if not os.path.exists(splines_dir):
+        try:
+            spline_files = [f for f in os.listdir(splines_dir) if f.endswith('.json')]
+        except FileNotFoundError:
             unreal.log_warning(f"Splines directory does not exist: {splines_dir}")
             os.makedirs(splines_dir, exist_ok=True)
         else:
-            # Check for the specific spline file we're expecting
-            expected_spline_file = f"splines_export_from_UE_{iteration_number}.json"
-            spline_files = [f for f in os.listdir(splines_dir) if f.endswith('.json')]
-            if expected_spline_file not in spline_files:
-                unreal.log_warning(f"Expected spline file not found: {expected_spline_file}")
-                unreal.log_warning(f"You may need to run the spline export script first")
-                unreal.log_warning(f"Available spline files: {spline_files}")
+            # Check for the specific spline files we're expecting
+            for expected_iteration in (iterations or [iteration_number]):
+                expected_spline_file = f"splines_export_from_UE_{expected_iteration}.json"
+                if expected_spline_file not in spline_files:
+                    unreal.log_warning(f"Expected spline file not found: {expected_spline_file}")
+                    unreal.log_warning(f"You may need to run the spline export script first")
+                    unreal.log_warning(f"Available spline files: {spline_files}")
         
         # Run the command - don't create a new console window when running from UE
         unreal.log("Running Houdini process...")
@@ -408,22 +442,20 @@ def run_houdini_sidewalks_roads(iteration_number, houdini_install_path, hip_file
             # No creationflags - this causes issues when running as a subprocess from UE
         )
         
-        # Wait a short time and check if process is still running
-        time.sleep(2)
-        if process.poll() is not None:
-            # Process has already terminated
-            stdout, stderr = process.communicate()
-            unreal.log_error(f"Houdini process terminated immediately with exit code: {process.returncode}")
-            unreal.log(f"STDOUT: {stdout}")
-            unreal.log_error(f"STDERR: {stderr}")
-            return None
-        
         unreal.log(f"Houdini process started with PID: {process.pid}")
-        unreal.log(f"Process is running. Waiting for completion...")
+        # Every iteration in a batch gets the full wait time
+        wait_timeout = HOUDINI_WAIT_TIMEOUT * len(iterations or [iteration_number])
+        unreal.log(f"Waiting for completion (up to {wait_timeout}s)...")
         
-        # Wait for process to complete with a timeout
+        # Wait for the process in a single call - this returns as soon as Houdini exits,
+        # so a quick failure is reported right away instead of after a fixed sleep
         try:
-            stdout, stderr = process.communicate(timeout=30)  # 30 second timeout
+            stdout, stderr = process.communicate(timeout=wait_timeout)
+            if process.returncode != 0:
+                unreal.log_error(f"Houdini process failed with exit code: {process.returncode}")
+                unreal.log(f"STDOUT: {stdout}")
+                unreal.log_error(f"STDERR: {stderr}")
+                return None
             unreal.log(f"Houdini process completed with exit code: {process.returncode}")
             unreal.log(f"STDOUT: {stdout}")
             if stderr:
@@ -432,23 +464,31 @@ def run_houdini_sidewalks_roads(iteration_number, houdini_install_path, hip_file
             unreal.log("Houdini process is still running after timeout. Continuing in background.")
             # Don't kill the process, let it continue running
         
-        # Check if the output files were created
-        road_fbx_exists = os.path.exists(road_fbx_path)
-        sidewalks_fbx_exists = os.path.exists(sidewalks_fbx_path)
-        
-        if not road_fbx_exists:
-            unreal.log_warning(f"Road FBX file was not created: {road_fbx_path}")
-        else:
-            unreal.log(f"Road FBX file exists at: {road_fbx_path}")
-            unreal.log(f"File size: {os.path.getsize(road_fbx_path)} bytes")
-        
-        if not sidewalks_fbx_exists:
-            unreal.log_warning(f"Sidewalks FBX file was not created: {sidewalks_fbx_path}")
-        else:
-            unreal.log(f"Sidewalks FBX file exists at: {sidewalks_fbx_path}")
-            unreal.log(f"File size: {os.path.getsize(sidewalks_fbx_path)} bytes")
+        # Check if the output files were created (for every iteration in batch mode)
+        road_fbx_exists = True
+        sidewalks_fbx_exists = True
+        for output_iteration in (iterations or [iteration_number]):
+            iteration_road_fbx_path = road_fbx_path.replace("{iteration}", str(output_iteration))
+            iteration_sidewalks_fbx_path = sidewalks_fbx_path.replace("{iteration}", str(output_iteration))
+            
+            road_fbx_size = get_file_size(iteration_road_fbx_path)
+            if road_fbx_size is None:
+                road_fbx_exists = False
+                unreal.log_warning(f"Road FBX file was not created: {iteration_road_fbx_path}")
+            else:
+                unreal.log(f"Road FBX file exists at: {iteration_road_fbx_path}")
+                unreal.log(f"File size: {road_fbx_size} bytes")
+            
+            sidewalks_fbx_size = get_file_size(iteration_sidewalks_fbx_path)
+            if sidewalks_fbx_size is None:
+                sidewalks_fbx_exists = False
+                unreal.log_warning(f"Sidewalks FBX file was not created: {iteration_sidewalks_fbx_path}")
+            else:
+                unreal.log(f"Sidewalks FBX file exists at: {iteration_sidewalks_fbx_path}")
+                unreal.log(f"File size: {sidewalks_fbx_size} bytes")
         
         return {
+            'iterations': iterations or [iteration_number],
             'process_id': process.pid,
             'road_fbx_path': road_fbx_path,
             'sidewalks_fbx_path': sidewalks_fbx_path,
@@ -471,6 +511,19 @@ result = run_houdini_sidewalks_roads(
 )
 unreal.log(f"Houdini sidewalks & roads generation result: {result}")
 
+# Run Houdini sidewalks & roads generation for several iterations in one hython process (uncomment to use)
+# The .hip file is loaded once and every iteration is cooked against it
+# result = run_houdini_sidewalks_roads(
+#     iteration_number=ITERATION_NUMBER,
+#     houdini_install_path=HOUDINI_INSTALL_PATH,
+#     hip_file_path=SWR_HIP_FILE_PATH,
+#     file1_path=get_file1_path("{iteration}"),
+#     base_path=SPLINES_BASEPATH_OUTPUT_DIR,
+#     switch_bool=SWITCH_BOOL,
+#     iterations=list(range(ITERATION_NUMBER + 1))
+# )
+# unreal.log(f"Houdini sidewalks & roads batch result: {result}")
+
 # Reimport static meshes
 # result = run_script("210_reimport_SM.py", "reimport_folder_static_meshes",
 #         iteration_number=ITERATION_NUMBER,
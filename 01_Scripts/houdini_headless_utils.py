@@ -0,0 +1,232 @@
+"""
+Shared helpers for the headless Houdini scripts
+-----------------------------------------------
+
+Used by 100_headless_topnet_PCGHD.py and 200_headless_topnet_SWR.py, which both load
+a .hip file in hython and cook a TOP network. Everything here runs inside hython;
+hou and pdg are imported when a helper is called, so importing this module is cheap.
+"""
+
+import contextlib
+import os
+import pathlib
+import sys
+import time
+import threading
+import logging
+import logging.handlers
+
+# Messages go through the same stdout handler the calling script sets up
+log = logging.getLogger('headless')
+
+# How many log records are buffered before they're written to stdout
+LOG_BATCH_SIZE = 64
+
+# Log handler that writes to stdout in batches
+# Records are buffered and written with a single write + flush per batch instead of one per
+# line; warnings and errors flush the batch right away so they're never held back
+class _BatchedLogHandler(logging.handlers.MemoryHandler):
+    """Buffer log records and write each batch to stdout in one go"""
+    def flush(self):
+        self.acquire()
+        try:
+            if self.buffer:
+                sys.stdout.write("".join(self.format(record) + "\n" for record in self.buffer))
+                sys.stdout.flush()
+                self.buffer.clear()
+        finally:
+            self.release()
+
+# Helper function to set up logging
+def configure_logging(level=logging.INFO):
+    """Send log records to stdout (the manager script treats anything on stderr as an error)"""
+    handler = _BatchedLogHandler(LOG_BATCH_SIZE, flushLevel=logging.WARNING)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(message)s', datefmt='%H:%M:%S'))
+    logging.basicConfig(level=level, handlers=[handler])
+
+# Helper function to write out any buffered log records
+def flush_log():
+    """Flush the root handlers, so progress messages show up before we block"""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+# Helper function to normalize a path argument once, up front
+def normalize_path(path):
+    """Return path with forward slashes (e.g. S:/Undini/file.hip), or None if no path was given"""
+    if path is None:
+        return None
+    return pathlib.PureWindowsPath(path).as_posix()
+
+# Helper to apply a batch of parameter edits as a single change
+@contextlib.contextmanager
+def deferred_updates():
+    """Switch Houdini to manual updates, pause simulations and skip undo records while parameters are being set"""
+    import hou
+    
+    previous_mode = hou.updateModeSetting()
+    simulation_enabled = hou.simulationEnabled()
+    hou.setUpdateMode(hou.updateMode.Manual)
+    hou.setSimulationEnabled(False)
+    try:
+        with hou.undos.disabler():
+            yield
+    finally:
+        hou.setSimulationEnabled(simulation_enabled)
+        hou.setUpdateMode(previous_mode)
+
+# Helper function to create the output folders before anything is cooked
+def ensure_output_directories(paths, exit_on_error=True):
+    """
+    Create the parent folder of every output path.
+    
+    If a folder can't be created this exits with a clear error, or raises an OSError with the
+    same message when exit_on_error is False (e.g. so a server can report it and keep going).
+    """
+    for path in paths:
+        if not path:
+            continue
+        directory = os.path.dirname(path)
+        # Folders that depend on the iteration ({iteration}) or on Houdini variables ($HIP)
+        # can only be resolved inside Houdini, so those are left to the ROP
+        if not directory or "{" in directory or "$" in directory:
+            continue
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            # Covers missing permissions as well as unmapped drives, bad names and files in the way
+            if not exit_on_error:
+                raise OSError(f"Can't create the output folder {directory}: {str(e)}") from e
+            log.error(f"❌ ERROR: Can't create the output folder {directory}: {str(e)}")
+            log.info("Please check the output paths and the permissions on that folder.")
+            sys.exit(1)
+
+# Helper function to write a node's Python code back only when it actually changed
+def set_python_code(python_code_parm, current_code, new_code, description):
+    """Set the Python code parameter to new_code, skipping the set when the code is unchanged"""
+    # Setting the code makes Houdini re-parse the Python SOP and recook everything after it
+    if new_code == current_code:
+        log.debug("✅ Python code already sets %s", description)
+        return
+    python_code_parm.set(new_code)
+    log.info(f"✅ Modified Python code to set {description}")
+
+# Helper function to throttle how many work items PDG cooks at once
+def limit_scheduler_slots(topnet_node, max_inflight):
+    """Set a custom slot count on the TOPnet's local scheduler to bound in-flight work items"""
+    if max_inflight is None:
+        return False
+    
+    # The TOPnet's default scheduler is referenced by its 'topscheduler' parameter
+    scheduler = None
+    scheduler_parm = topnet_node.parm("topscheduler")
+    if scheduler_parm is not None and scheduler_parm.eval():
+        scheduler = topnet_node.node(scheduler_parm.eval())
+    if scheduler is None:
+        log.warning("⚠️ WARNING: Could not find the TOPnet's scheduler, keeping the default slot count")
+        return False
+    
+    slots_menu_parm = scheduler.parm("maxprocsmenu")
+    slots_parm = scheduler.parm("maxprocs")
+    if slots_menu_parm is None or slots_parm is None:
+        log.warning(f"⚠️ WARNING: Scheduler {scheduler.path()} has no slot count parameters, keeping its settings")
+        return False
+    
+    # Switch the "Total Slots" menu to its custom entry so our slot count is used
+    for token, label in zip(slots_menu_parm.menuItems(), slots_menu_parm.menuLabels()):
+        if "custom" in label.lower():
+            slots_menu_parm.set(token)
+            break
+    slots_parm.set(max_inflight)
+    log.info(f"✅ Limited {scheduler.path()} to {max_inflight} work items at a time")
+    return True
+
+# Helper function to cook the TOPnet's output node
+def cook_topnet(output_node, wait_mode="event", max_wait_time=None):
+    """
+    Cook the output node's work items and wait for them to finish.
+    
+    wait_mode picks how we wait for PDG:
+      • event: listen for the graph context's cook complete event (default, lowest latency)
+      • blocking: let cookWorkItems() block until PDG is done (max_wait_time is ignored)
+      • poll: check the graph context with an exponential backoff (0.2s up to 5s)
+    Returns (finished, cook_errors): finished is False if the cook was cancelled after
+    max_wait_time, and cook_errors lists the messages of the CookError events PDG reported.
+    """
+    import pdg
+    
+    # The PDG graph context lives on the TOP nodes inside the network
+    context = output_node.getPDGGraphContext()
+    if context is None:
+        # Without a graph context we can't listen for events, so fall back to a blocking cook
+        if wait_mode != "blocking":
+            log.warning("⚠️ PDG graph context not available, cooking with a blocking call instead...")
+        flush_log()
+        output_node.cookWorkItems(block=True)
+        return True, []
+    
+    # Collect the cook errors in every wait mode, so callers can tell a clean cook from a failed one
+    cook_finished = threading.Event()
+    cook_errors = []
+    
+    def on_cook_complete(event):
+        cook_finished.set()
+    
+    def on_cook_error(event):
+        cook_errors.append(event.message)
+    
+    handlers = [
+        context.addEventHandler(on_cook_complete, pdg.EventType.CookComplete),
+        context.addEventHandler(on_cook_error, pdg.EventType.CookError)
+    ]
+    try:
+        if wait_mode == "blocking":
+            flush_log()
+            output_node.cookWorkItems(block=True)
+            finished = True
+        elif wait_mode == "event":
+            # Start the cook in the background; the handlers above tell us when it's done
+            output_node.cookWorkItems(block=False)
+            log.info("✅ TOP network execution started")
+            
+            # Wait for the cook complete event
+            log.info("\nWaiting for cook to complete...")
+            flush_log()
+            finished = cook_finished.wait(max_wait_time)
+        else:
+            finished = _poll_cook(context, output_node, max_wait_time)
+    finally:
+        for handler in handlers:
+            context.removeEventHandler(handler)
+    
+    for message in cook_errors:
+        log.warning(f"⚠️ Cook error: {message}")
+    
+    if not finished:
+        log.warning(f"⚠️ WARNING: Cook still running after {max_wait_time}s, cancelling it")
+        context.cancelCook()
+    return finished, cook_errors
+
+# Helper function to wait for a cook by polling the graph context
+def _poll_cook(context, output_node, max_wait_time):
+    """Start the cook and poll until it's done, returning False if max_wait_time ran out first"""
+    output_node.cookWorkItems(block=False)
+    flush_log()
+    
+    start_time = time.monotonic()
+    delay = 0.2
+    next_report = 10
+    while context.cooking:
+        elapsed = time.monotonic() - start_time
+        if max_wait_time is not None and elapsed >= max_wait_time:
+            return False
+        if elapsed >= next_report:  # Only print every 10 seconds to reduce noise
+            log.info(f"  ⏳ Still cooking... ({int(elapsed)}s elapsed)")
+            flush_log()
+            next_report += 10
+        # Never sleep past the deadline, so a timeout is honoured to within one poll
+        if max_wait_time is not None:
+            time.sleep(min(delay, max_wait_time - elapsed))
+        else:
+            time.sleep(delay)
+        delay = min(delay * 1.5, 5.0)
+    return True